@@ -1,73 +1,132 @@
-import boto3
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, FrozenSet, Tuple
+
+from cachetools import TTLCache
+
+from infra_archaeology_mcp.aws.session import CLIENT_CONFIG, get_async_session
+
+MAX_LOOKUP_EVENTS = 500  # cap on events scanned per lookup
+CACHE_SIZE = 10000
+HIT_TTL_SECONDS = 3600  # creation events never change
+MISS_TTL_SECONDS = 300  # delivery lag: misses, fallbacks
+WINDOW_REFRESH_SECONDS = 300
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedEvent:
+    """Creation details from a CloudTrail event"""
+    creator: str
+    created_at: datetime
+    event_name: str
+    source_ip: str
+    user_agent: str
+    event_id: str
+
 
 class CloudTrailClient:
-    
+
     def __init__(self, region: str = "us-east-1", profile: str = "infra-archaeology-mcp"):
-        session = boto3.Session(profile_name=profile, region_name=region)
-        self.client = session.client('cloudtrail')
+        self.session = get_async_session(profile, region)
         self.region = region
-    
-    def find_create_event(self, resouce_id: str, event_names: List[str], lookback_days: int = 90) -> Optional[Dict]:
+        self._cache = TTLCache(maxsize=CACHE_SIZE, ttl=HIT_TTL_SECONDS)
+        self._miss_cache = TTLCache(maxsize=CACHE_SIZE, ttl=MISS_TTL_SECONDS)
+        self._start_times: Dict[int, Tuple[float, datetime]] = {}
+
+    async def find_create_event(self, resouce_id: str, event_names: FrozenSet[str], lookback_days: int = 90) -> Optional[ParsedEvent]:
         """
         Search CloudTrail for resource creation event
-        
+
         Args:
             resource_id: The resource ID to search for
-            event_names: List of CloudTrail event names to search (e.g., ['RunInstances'])
+            event_names: CloudTrail event names to search (e.g., {'RunInstances'})
             lookback_days: How many days back to search
-            
+
         Returns:
-            Dictionary with creator info, or None if not found
+            ParsedEvent with creator info, or None if not found
         """
-        end_time = datetime.now()
-        start_time = end_time - timedelta(days=lookback_days)
-        
-        try: 
-            #Query to CloudTrail
-            response = self.client.lookup_events(
+        key = (resouce_id, frozenset(event_names), lookback_days)
+        if key in self._cache:
+            return self._cache[key]
+        if key in self._miss_cache:
+            return self._miss_cache[key]
+
+        start_time = self._start_time(lookback_days)
+
+        try:
+            event, matched = await self._lookup_create_event(resouce_id, event_names, start_time)
+        except Exception as e:
+            print(f"CloudTrail query error: {e}")
+            return None  # errors are not cached
+
+        if matched:
+            self._cache[key] = event
+        else:
+            self._miss_cache[key] = event  # creation event may still arrive
+
+        return event
+
+    def _start_time(self, lookback_days: int) -> datetime:
+        """Lookback start in UTC, refreshed every few minutes"""
+        now = time.monotonic()
+        cached = self._start_times.get(lookback_days)
+        if cached and now - cached[0] < WINDOW_REFRESH_SECONDS:
+            return cached[1]
+
+        start_time = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+        self._start_times[lookback_days] = (now, start_time)
+        return start_time
+
+    async def _lookup_create_event(
+        self,
+        resouce_id: str,
+        event_names: FrozenSet[str],
+        start_time: datetime
+    ) -> Tuple[Optional[ParsedEvent], bool]:
+        """Query CloudTrail; flag whether a creation event matched"""
+        oldest_event = None
+
+        #Query to CloudTrail, newest events first
+        async with self.session.client('cloudtrail', config=CLIENT_CONFIG) as ct:
+            paginator = ct.get_paginator('lookup_events')
+            pages = paginator.paginate(
                 LookupAttributes = [
                     {
                         'AttributeKey': 'ResourceName',
                         'AttributeValue': resouce_id
                     }
                 ],
-                StartTime = start_time,
-                EndTime = end_time,
-                MaxResults=50
+                StartTime = start_time,  # no EndTime: up to now
+                PaginationConfig={'MaxItems': MAX_LOOKUP_EVENTS}
             )
-            
-            #Find the creation event
-            for event in response.get('Events', []):
-                if event['EventName'] in event_names:
-                    return self._parse_event(event)
-            
-            if response.get('Events'):
-                oldest_event = sorted(
-                    response['Events'],
-                    key=lambda x: x['EventTime']
-                )[0]
-                return self._parse_event(oldest_event)
-            
-            return None
-        
-        except Exception as e:
-            print(f"CloudTrail query error: {e}")
-            return None
-    
-    def _parse_event(self, event: Dict) -> Dict:
-        return {
-            "creator": event.get('Username', 'Unknown'),
-            "created_at": event['EventTime'].isoformat(),
-            "event_name": event['EventName'],
-            "source_ip": event.get('SourceIPAddress', 'Unknown'),
-            "user_agent": event.get('UserAgent', 'Unknown'),
-            "event_id": event['EventId']
-        }
 
+            async for page in pages:
+                #Single pass: match creation event, track oldest
+                for event in page.get('Events', []):
+                    if event['EventName'] in event_names:
+                        return self._parse_event(event), True
+                    if oldest_event is None or event['EventTime'] < oldest_event['EventTime']:
+                        oldest_event = event
+
+        if oldest_event:
+            return self._parse_event(oldest_event), False
+
+        return None, False
+
+    def _parse_event(self, event: Dict) -> ParsedEvent:
+        return ParsedEvent(
+            creator=event.get('Username', 'Unknown'),
+            created_at=event['EventTime'],
+            event_name=event['EventName'],
+            source_ip=event.get('SourceIPAddress', 'Unknown'),
+            user_agent=event.get('UserAgent', 'Unknown'),
+            event_id=event['EventId']
+        )
+
+# frozensets: O(1) membership per scanned event
 EVENT_MAPPINGS = {
-    "ec2": ["RunInstances", "CreateInstance"],
-    "rds": ["CreateDBInstance", "CreateDBCluster"],
-    "s3": ["CreateBucket"]
-}
\ No newline at end of file
+    "ec2": frozenset({"RunInstances", "CreateInstance"}),
+    "rds": frozenset({"CreateDBInstance", "CreateDBCluster"}),
+    "s3": frozenset({"CreateBucket"})
+}
@@ -0,0 +1,11 @@
+"""Helpers for shaping AWS API responses"""
+
+from operator import itemgetter
+
+_get_key = itemgetter("Key")
+_get_value = itemgetter("Value")
+
+
+def tags_to_dict(tags: list[dict]) -> dict[str, str]:
+    """Convert AWS [{Key, Value}] tag list to a dict"""
+    return dict(zip(map(_get_key, tags), map(_get_value, tags)))
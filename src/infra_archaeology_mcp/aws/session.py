@@ -0,0 +1,46 @@
+"""Cached AWS sessions and clients"""
+
+import threading
+from functools import lru_cache
+from typing import Optional
+
+import aioboto3
+import boto3
+from botocore.config import Config
+
+# Room for concurrent calls plus throttle-aware retries
+CLIENT_CONFIG = Config(
+    max_pool_connections=64, retries={"max_attempts": 10, "mode": "adaptive"}
+)
+
+
+@lru_cache()
+def get_session(profile: Optional[str] = None) -> boto3.Session:
+    """Return cached boto3 session for a profile"""
+    return boto3.Session(profile_name=profile)
+
+
+# boto3 Sessions are not thread-safe
+_client_lock = threading.Lock()
+
+
+def get_client(profile: Optional[str], region: Optional[str], service: str):
+    """Return cached boto3 client for profile/region/service"""
+    with _client_lock:
+        return _get_client(profile, region, service)
+
+
+@lru_cache()
+def _get_client(profile: Optional[str], region: Optional[str], service: str):
+    """Create a client; caller holds _client_lock"""
+    return get_session(profile).client(
+        service, region_name=region, config=CLIENT_CONFIG
+    )
+
+
+@lru_cache()
+def get_async_session(
+    profile: Optional[str] = None, region: Optional[str] = None
+) -> aioboto3.Session:
+    """Return cached aioboto3 session for profile/region"""
+    return aioboto3.Session(profile_name=profile, region_name=region)
@@ -1,5 +1,5 @@
 """Terraform state parsing"""
 
-from .state_parser import TerraformStateParser
+from .state_parser import ParsedResource, ParsedState, TerraformStateParser
 
-__all__ = ["TerraformStateParser"]
+__all__ = ["ParsedResource", "ParsedState", "TerraformStateParser"]
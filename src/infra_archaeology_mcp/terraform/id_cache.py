@@ -0,0 +1,52 @@
+"""On-disk cache of managed IDs per state version"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "infra_archaeology"
+)
+
+
+def cache_path(source: str, version: str) -> Path:
+    """Cache file for a state source at a given version"""
+    source_key = hashlib.sha256(source.encode()).hexdigest()
+    version_key = hashlib.sha256(version.encode()).hexdigest()[:16]
+    return CACHE_DIR / source_key / f"{version_key}.ids"
+
+
+def read_ids(path: Path) -> Optional[frozenset[str]]:
+    """Return cached IDs, or None on miss"""
+    try:
+        with open(path, "rb") as f:
+            text = f.read().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    # Newline-delimited: O(ids) bytes, no JSON decode
+    return frozenset(filter(None, text.split("\n")))
+
+
+def write_ids(path: Path, ids: frozenset[str]) -> None:
+    """Write IDs, replacing older versions of the source"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for pattern in ("*.ids", "*.tmp"):
+            for stale in path.parent.glob(pattern):
+                stale.unlink(missing_ok=True)
+
+        # Unique temp file, then atomic rename
+        tmp = tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+        try:
+            with tmp as f:
+                f.write("\n".join(sorted(ids)).encode("utf-8"))
+            os.replace(tmp.name, path)
+        except OSError:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass  # cache is best-effort
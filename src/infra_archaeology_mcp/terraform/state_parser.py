@@ -1,8 +1,129 @@
 """Terraform state file parser"""
 
-import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Collection, Dict, Iterable, Iterator, List, Any, Tuple, Union
+
+import ijson
+import orjson
+
+STREAM_THRESHOLD_BYTES = 16 * 1024 * 1024  # stream states above this
+MAX_CACHED_STATES = 128
+STREAM_BUFFER_BYTES = 1 << 20  # fewer, larger reads
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedResource:
+    """Managed resource instance from a state file"""
+    address: str
+    type: str
+    name: str
+    module: Optional[str]
+    aws_id: Optional[str]
+    attributes: Dict[str, Any]
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedState:
+    """Parsed resources and ID index for one state"""
+    resources: List[ParsedResource]
+    id_map: Dict[str, ParsedResource]
+
+    def find(
+        self,
+        aws_id: str,
+        resource_types: Optional[Collection[str]] = None
+    ) -> Optional[ParsedResource]:
+        """First resource with this ID, optionally of given types"""
+        record = self.id_map.get(aws_id)
+        if record is None or resource_types is None or record.type in resource_types:
+            return record
+
+        # Index holds a sibling (e.g. bucket policy); scan
+        return next(
+            (r for r in self.resources
+             if r.aws_id == aws_id and r.type in resource_types),
+            None
+        )
+
+
+def _managed(resources: Iterable[Dict]) -> Iterator[Tuple[str, str, Optional[str], List[Dict]]]:
+    """Yield (type, name, module, instances) per managed resource"""
+    for resource in resources:
+        if resource.get("mode") == "managed":
+            yield (
+                resource.get("type", ""),
+                resource.get("name", ""),
+                resource.get("module"),
+                resource.get("instances", [])
+            )
+
+
+@lru_cache(maxsize=4096)
+def _address_key(
+    module: Optional[str],
+    resource_type: str,
+    name: str,
+    index: Optional[Any]
+) -> str:
+    """Format address; cached since instances share groups"""
+    address = f"{resource_type}.{name}"
+
+    if index is not None:
+        if isinstance(index, int):
+            address = f"{address}[{index}]"
+        else:
+            address = f"{address}[\"{index}\"]"
+
+    if module:
+        address = f"{module}.{address}"
+
+    return address
+
+
+def _make_record(
+    module: Optional[str],
+    resource_type: str,
+    resource_name: str,
+    instance: Dict
+) -> ParsedResource:
+    attrs = instance.get("attributes", {})
+    return ParsedResource(
+        address=_address_key(
+            module, resource_type, resource_name, instance.get("index_key")
+        ),
+        type=resource_type,
+        name=resource_name,
+        module=module,
+        aws_id=attrs.get("id"),
+        attributes=attrs
+    )
+
+
+def _index(resources: Iterable[Dict]) -> ParsedState:
+    """Build records and ID index from state resources"""
+    records = [
+        _make_record(module, resource_type, resource_name, instance)
+        for resource_type, resource_name, module, instances in _managed(resources)
+        for instance in instances
+    ]
+
+    id_map = {}
+    for record in records:
+        if record.aws_id:
+            id_map.setdefault(record.aws_id, record)  # first wins
+
+    return ParsedState(resources=records, id_map=id_map)
+
+
+def _loads(json_str: Union[str, bytes]) -> Dict:
+    """Decode state JSON, raising ValueError if invalid"""
+    try:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
 
 
 class TerraformStateParser:
@@ -10,61 +131,128 @@ class TerraformStateParser:
 
     def __init__(self):
         self._state: Optional[Dict] = None
-        self._resources: List[Dict] = []
+        self._resources: List[ParsedResource] = []
+        self._id_map: Dict[str, ParsedResource] = {}
+        self._metadata_map: Optional[Dict[str, Dict]] = None
+
+    @classmethod
+    def parse_json(cls, json_str: Union[str, bytes]) -> ParsedState:
+        """Parse state JSON without building a parser"""
+        state = _loads(json_str)
+        return _index(state.get("resources", []) if state else [])
+
+    @classmethod
+    def parse_file(cls, path: str) -> ParsedState:
+        """Parse a state file, memoized while it is unchanged"""
+        stat = os.stat(path)
+        if stat.st_size > STREAM_THRESHOLD_BYTES:
+            return _parse_file(path)  # too big to pin in memory
+
+        return _parse_file_cached(
+            os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+        )
+
+    @classmethod
+    def find_in_file(
+        cls,
+        path: str,
+        aws_id: str,
+        resource_types: Optional[Collection[str]] = None
+    ) -> Optional[ParsedResource]:
+        """Stream a state file, stopping at the first match"""
+        file_path = Path(path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"State file not found: {path}")
+
+        with open(file_path, 'rb', buffering=0) as f:
+            try:
+                resources = ijson.items(
+                    f, "resources.item", use_float=True, buf_size=STREAM_BUFFER_BYTES
+                )
+                for resource_type, resource_name, module, instances in _managed(resources):
+                    if resource_types is not None and resource_type not in resource_types:
+                        continue  # skip instances of other types
+                    for instance in instances:
+                        if instance.get("attributes", {}).get("id") == aws_id:
+                            return _make_record(module, resource_type, resource_name, instance)
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid JSON: {e}")
+
+        return None
+
+    @classmethod
+    def ids_in_file(cls, path: str) -> frozenset[str]:
+        """Stream managed AWS IDs, dropping attributes"""
+        file_path = Path(path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"State file not found: {path}")
+
+        with open(file_path, 'rb', buffering=0) as f:
+            try:
+                resources = ijson.items(
+                    f, "resources.item", use_float=True, buf_size=STREAM_BUFFER_BYTES
+                )
+                return frozenset(
+                    aws_id
+                    for _, _, _, instances in _managed(resources)
+                    for instance in instances
+                    if (aws_id := instance.get("attributes", {}).get("id"))
+                )
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid JSON: {e}")
 
     @property
-    def resources(self) -> List[Dict]:
+    def resources(self) -> List[ParsedResource]:
         """Parsed resources list"""
         return self._resources
 
+    @property
+    def id_map(self) -> Dict[str, ParsedResource]:
+        """AWS ID -> resource index built at load"""
+        return self._id_map
+
     def load_from_file(self, path: str) -> None:
         """Load state from file path"""
         file_path = Path(path)
         if not file_path.exists():
             raise FileNotFoundError(f"State file not found: {path}")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            self.load_from_json(f.read())
+        if file_path.stat().st_size <= STREAM_THRESHOLD_BYTES:
+            with open(file_path, 'rb') as f:
+                self.load_from_bytes(f.read())
+            return
+
+        self._state = None  # only resources are kept
+
+        # Stream in chunks, no heap copy of the file
+        with open(file_path, 'rb', buffering=0) as f:
+            try:
+                self._collect(ijson.items(
+                    f, "resources.item", use_float=True, buf_size=STREAM_BUFFER_BYTES
+                ))
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid JSON: {e}")
 
     def load_from_json(self, json_str: str) -> None:
         """Load state from JSON string"""
-        try:
-            self._state = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON: {e}")
+        self._state = _loads(json_str)
+        self._parse_resources()
 
+    def load_from_bytes(self, data: bytes) -> None:
+        """Load state from raw JSON bytes, skipping decode"""
+        self._state = _loads(data)
         self._parse_resources()
 
     def _parse_resources(self) -> None:
         """Extract resources from state"""
-        self._resources = []
+        self._collect(self._state.get("resources", []) if self._state else [])
 
-        if not self._state:
-            return
-
-        for resource in self._state.get("resources", []):
-            if resource.get("mode") != "managed":
-                continue
-
-            resource_type = resource.get("type", "")
-            resource_name = resource.get("name", "")
-            module = resource.get("module")
-
-            for instance in resource.get("instances", []):
-                attrs = instance.get("attributes", {})
-                aws_id = attrs.get("id")
-                index = instance.get("index_key")
-
-                address = self._build_address(module, resource_type, resource_name, index)
-
-                self._resources.append({
-                    "address": address,
-                    "type": resource_type,
-                    "name": resource_name,
-                    "module": module,
-                    "aws_id": aws_id,
-                    "attributes": attrs
-                })
+    def _collect(self, resources: Iterable[Dict]) -> None:
+        """Store records and ID index from state resources"""
+        parsed = _index(resources)
+        self._resources = parsed.resources
+        self._id_map = parsed.id_map
+        self._metadata_map = None
 
     def _build_address(
         self,
@@ -74,35 +262,35 @@ class TerraformStateParser:
         index: Optional[Any]
     ) -> str:
         """Build Terraform resource address"""
-        address = f"{resource_type}.{name}"
-
-        if index is not None:
-            if isinstance(index, int):
-                address = f"{address}[{index}]"
-            else:
-                address = f"{address}[\"{index}\"]"
+        return _address_key(module, resource_type, name, index)
 
-        if module:
-            address = f"{module}.{address}"
-
-        return address
-
-    def find_by_id(self, aws_id: str) -> Optional[Dict]:
+    def find_by_id(self, aws_id: str) -> Optional[ParsedResource]:
         """Find resource by AWS resource ID"""
-        for resource in self._resources:
-            if resource.get("aws_id") == aws_id:
-                return resource
-        return None
+        return self._id_map.get(aws_id)
 
     def build_id_map(self) -> Dict[str, Dict]:
-        """Build AWS ID -> Terraform metadata map"""
-        return {
-            r["aws_id"]: {
-                "address": r["address"],
-                "type": r["type"],
-                "module": r["module"],
-                "attributes": r["attributes"]
+        """Build AWS ID -> Terraform metadata map, once per load"""
+        if self._metadata_map is None:
+            self._metadata_map = {
+                aws_id: {
+                    "address": r.address,
+                    "type": r.type,
+                    "module": r.module,
+                    "attributes": r.attributes
+                }
+                for aws_id, r in self._id_map.items()
             }
-            for r in self._resources
-            if r.get("aws_id")
-        }
+        return self._metadata_map
+
+
+def _parse_file(path: str) -> ParsedState:
+    """Parse a state file into a snapshot"""
+    parser = TerraformStateParser()
+    parser.load_from_file(path)
+    return ParsedState(resources=parser.resources, id_map=parser.id_map)
+
+
+@lru_cache(maxsize=MAX_CACHED_STATES)
+def _parse_file_cached(path: str, mtime_ns: int, size: int) -> ParsedState:
+    """Parse keyed by stat, so edits miss the cache"""
+    return _parse_file(path)
@@ -3,9 +3,22 @@ Tool: who_created_resource
 Finds the creator of a cloud resource
 """
 
-import boto3
+import asyncio
+import re
 from datetime import datetime
+from functools import lru_cache
 from infra_archaeology_mcp.aws.cloudtrail import CloudTrailClient, EVENT_MAPPINGS
+from infra_archaeology_mcp.aws.resources import tags_to_dict
+from infra_archaeology_mcp.aws.session import CLIENT_CONFIG, get_async_session
+
+# One pass over the user agent instead of four
+_UA_RE = re.compile(r'(console|terraform|cloudformation|aws-cli)', re.IGNORECASE)
+_UA_MAP = {
+    'console': "AWS Console",
+    'terraform': "Terraform",
+    'cloudformation': "CloudFormation",
+    'aws-cli': "AWS CLI"
+}
 
 async def who_created_resource(
     resource_id: str,
@@ -22,12 +35,14 @@ async def who_created_resource(
         Dictionary with creator information
     """
     
-    resource_info = await _get_resource_info(resource_id, resource_type, region)
-    
-    ct_client = CloudTrailClient(region=region)
-    event_names = EVENT_MAPPINGS.get(resource_type, [])
+    ct_client = _cloudtrail_client(region)
+    event_names = EVENT_MAPPINGS.get(resource_type, frozenset())
     
-    creation_event = ct_client.find_create_event(resource_id, event_names)
+    # Independent API calls - run them concurrently
+    resource_info, creation_event = await asyncio.gather(
+        _get_resource_info(resource_id, resource_type, region),
+        ct_client.find_create_event(resource_id, event_names)
+    )
     
     result = {
         "resource_id": resource_id,
@@ -38,11 +53,11 @@ async def who_created_resource(
     
     if creation_event:
         result.update({
-            "creator": creation_event["creator"],
-            "created_at": creation_event["created_at"],
-            "creation_method": _parse_user_agent(creation_event["user_agent"]),
-            "source_ip": creation_event["source_ip"],
-            "cloudtrail_event_id": creation_event["event_id"]
+            "creator": creation_event.creator,
+            "created_at": creation_event.created_at,
+            "creation_method": _parse_user_agent(creation_event.user_agent),
+            "source_ip": creation_event.source_ip,
+            "cloudtrail_event_id": creation_event.event_id
         })
     else:
         result.update({
@@ -52,65 +67,74 @@ async def who_created_resource(
     
     return result
 
+@lru_cache()
+def _cloudtrail_client(region: str) -> CloudTrailClient:
+    """Shared client per region so its event cache persists"""
+    return CloudTrailClient(region=region)
+
 async def _get_resource_info(resource_id: str, resource_type: str, region: str) -> dict:
     #Get more more info for the current resource event
-    session = boto3.Session(region_name=region)
-    
-    if resource_type == "ec2":
-        ec2 = session.client('ec2')
-        try: 
-            response = ec2.describe_instances(InstanceIds=[resource_id])
-            if response['Reservations']:
-                instance = response['Reservations'][0]['Instances'][0]
-                return {
-                    "state": instance['State']['Name'],
-                    "instance_type": instance['InstanceType'],
-                    "launch_time": instance['LaunchTime'].isoformat(),
-                    "tags": {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-                }
-        except Exception as e:
-            return {"error": f"Failed to get EC2 info: {str(e)}"}
-        
-    elif resource_type == "rds":
-        rds = session.client('rds')
-        try:
-            response = rds.describe_db_instances(DBInstanceIdentifier=resource_id)
-            if response['DBInstances']:
-                db = response['DBInstances'][0]
-                return {
-                    "state": db['DBInstanceStatus'],
-                    "engine": db['Engine'],
-                    "instance_class": db['DBInstanceClass'],
-                    "created_time": db['InstanceCreateTime'].isoformat() if 'InstanceCreateTime' in db else None
-                }
-        except Exception as e:
-            return {"error": f"Failed to get RDS info: {str(e)}"}
-    
-    elif resource_type == "s3":
-        s3 = session.client('s3')
-        try:
-            # S3 bucket names are the resource_id
-            response = s3.get_bucket_location(Bucket=resource_id)
-            tags_response = s3.get_bucket_tagging(Bucket=resource_id)
-            return {
-                "location": response['LocationConstraint'] or 'us-east-1',
-                "tags": {tag['Key']: tag['Value'] for tag in tags_response.get('TagSet', [])}
-            }
-        except Exception as e:
-            # Bucket might not have tags
-            return {"note": "Bucket exists but tagging not available"}
-    
-    return {}
+    handler = _RESOURCE_HANDLERS.get(resource_type)
+    if handler is None:
+        return {}
+
+    service, describe = handler
+    session = get_async_session(None, region)
+
+    try:
+        async with session.client(service, config=CLIENT_CONFIG) as client:
+            return await describe(client, resource_id)
+    except Exception as e:
+        return {"error": f"Failed to get {resource_type.upper()} info: {str(e)}"}
+
+async def _describe_ec2(ec2, resource_id: str) -> dict:
+    response = await ec2.describe_instances(InstanceIds=[resource_id])
+    if not response['Reservations']:
+        return {}
+    instance = response['Reservations'][0]['Instances'][0]
+    return {
+        "state": instance['State']['Name'],
+        "instance_type": instance['InstanceType'],
+        "launch_time": instance['LaunchTime'],
+        "tags": tags_to_dict(instance.get('Tags', []))
+    }
+
+async def _describe_rds(rds, resource_id: str) -> dict:
+    response = await rds.describe_db_instances(DBInstanceIdentifier=resource_id)
+    if not response['DBInstances']:
+        return {}
+    db = response['DBInstances'][0]
+    return {
+        "state": db['DBInstanceStatus'],
+        "engine": db['Engine'],
+        "instance_class": db['DBInstanceClass'],
+        "created_time": db.get('InstanceCreateTime')
+    }
+
+async def _describe_s3(s3, resource_id: str) -> dict:
+    try:
+        # S3 bucket names are the resource_id
+        response = await s3.get_bucket_location(Bucket=resource_id)
+        tags_response = await s3.get_bucket_tagging(Bucket=resource_id)
+        return {
+            "location": response['LocationConstraint'] or 'us-east-1',
+            "tags": tags_to_dict(tags_response.get('TagSet', []))
+        }
+    except Exception:
+        # Bucket might not have tags
+        return {"note": "Bucket exists but tagging not available"}
+
+# resource_type -> (client service, describe coroutine)
+_RESOURCE_HANDLERS = {
+    "ec2": ("ec2", _describe_ec2),
+    "rds": ("rds", _describe_rds),
+    "s3": ("s3", _describe_s3),
+}
+
 #type of creation used for resource
 def _parse_user_agent(user_agent: str) -> str:
     """Parse user agent to determine creation method"""
-    if 'console' in user_agent.lower():
-        return "AWS Console"
-    elif 'terraform' in user_agent.lower():
-        return "Terraform"
-    elif 'cloudformation' in user_agent.lower():
-        return "CloudFormation"
-    elif 'aws-cli' in user_agent.lower():
-        return "AWS CLI"
-    else:
-        return f"API ({user_agent[:50]}...)"
\ No newline at end of file
+    match = _UA_RE.search(user_agent)
+    if match:
+        return _UA_MAP[match.group(1).lower()]
+    return f"API ({user_agent[:50]}...)"
\ No newline at end of file
@@ -1,16 +1,47 @@
 """Tool: find_orphaned_resources - detect AWS resources not in Terraform"""
 
-import boto3
-import aioboto3
-from datetime import datetime, timedelta
+import asyncio
+import heapq
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from typing import Optional
+from botocore.exceptions import BotoCoreError, ClientError
+from infra_archaeology_mcp.aws.resources import tags_to_dict
+from infra_archaeology_mcp.aws.session import CLIENT_CONFIG, get_async_session, get_client
+from infra_archaeology_mcp.terraform import id_cache
 from infra_archaeology_mcp.terraform.state_parser import TerraformStateParser
 
+MAX_CONCURRENT_SCANS = 16
+STATE_FETCH_TIMEOUT = 30  # seconds per state file
+MAX_BUCKET_WORKERS = 32
+CE_FILTER_CHUNK = 100  # resource IDs per CE query
+CW_QUERY_CHUNK = 500  # GetMetricData query limit
+
+_get_cost = itemgetter("monthly_cost")
+
+# Concurrent identical scans share one AWS call
+_in_flight: dict[tuple, asyncio.Future] = {}
+
+
+@lru_cache(maxsize=4096)
+def _isoformat(timestamp: datetime) -> str:
+    """ISO string; batch launches share timestamps"""
+    return timestamp.isoformat()
+
 
 async def find_orphaned_resources(
     region: str,
     state_sources: Optional[list[str]] = None,
-    resource_types: list[str] = ["ec2", "rds", "s3"]
+    resource_types: list[str] = ["ec2", "rds", "s3"],
+    top_k: Optional[int] = None
 ) -> dict:
     """
     Find AWS resources not managed by any Terraform state.
@@ -19,6 +50,7 @@ async def find_orphaned_resources(
         region: AWS region to scan
         state_sources: List of state file paths (S3 URIs or local paths)
         resource_types: Resource types to check
+        top_k: Only return the K most expensive orphans
 
     Returns:
         summary + list of orphaned resources sorted by monthly cost
@@ -26,31 +58,56 @@ async def find_orphaned_resources(
     if not state_sources:
         return {"error": "state_sources required", "orphaned_resources": []}
 
-    # Step 1: Build set of all Terraform-managed IDs (O(n) once)
-    managed_ids = await _build_managed_id_set(state_sources)
-
-    # Step 2: Fetch all AWS resources in region
-    aws_resources = await _fetch_aws_resources(region, resource_types)
+    # Steps 1-2: Independent; fetch together
+    managed_ids, aws_resources = await asyncio.gather(
+        _build_managed_id_set(state_sources),
+        _fetch_aws_resources(region, resource_types)
+    )
 
     # Step 3: Filter to orphaned (O(1) per resource)
     orphaned = [r for r in aws_resources if r["resource_id"] not in managed_ids]
 
+    # Nothing orphaned: skip Cost Explorer entirely
+    if not orphaned:
+        return _build_report(region, resource_types, state_sources, orphaned, 0.0, 0)
+
     # Step 4: Enrich with cost data
     resource_ids = [r["resource_id"] for r in orphaned]
     costs = await _fetch_costs(region, resource_ids)
 
     for resource in orphaned:
         resource["monthly_cost"] = costs.get(resource["resource_id"], 0.0)
-        resource["recommendation"] = _generate_recommendation(resource)
+
+    total_orphaned = len(orphaned)
+    total_cost = math.fsum(map(_get_cost, orphaned))  # exact float sum
 
     # Step 5: Sort by cost (highest first)
-    orphaned.sort(key=lambda r: r["monthly_cost"], reverse=True)
+    if top_k is not None:
+        orphaned = heapq.nlargest(top_k, orphaned, key=_get_cost)  # O(N log k)
+    else:
+        orphaned.sort(key=_get_cost, reverse=True)
 
-    total_cost = sum(r["monthly_cost"] for r in orphaned)
+    # Only the returned orphans need recommendations
+    for resource, recommendation in zip(orphaned, _generate_recommendations(orphaned)):
+        resource["recommendation"] = recommendation
 
+    return _build_report(
+        region, resource_types, state_sources, orphaned, total_cost, total_orphaned
+    )
+
+
+def _build_report(
+    region: str,
+    resource_types: list[str],
+    state_sources: list[str],
+    orphaned: list[dict],
+    total_cost: float,
+    total_orphaned: int
+) -> dict:
+    """Assemble summary and orphan list response"""
     return {
         "summary": {
-            "total_orphaned": len(orphaned),
+            "total_orphaned": total_orphaned,
             "total_monthly_cost": round(total_cost, 2),
             "region": region,
             "resource_types_scanned": resource_types,
@@ -60,182 +117,348 @@ async def find_orphaned_resources(
     }
 
 
-async def _build_managed_id_set(state_sources: list[str]) -> set[str]:
+async def _build_managed_id_set(state_sources: list[str]) -> frozenset[str]:
     """Load all state files and build set of managed resource IDs"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCANS)
+
+    async with AsyncExitStack() as stack:
+        # One S3 client (and connection pool) for every remote state
+        s3 = None
+        if any(source.startswith("s3://") for source in state_sources):
+            s3 = await stack.enter_async_context(
+                get_async_session().client("s3", config=CLIENT_CONFIG)
+            )
+
+        results = await asyncio.gather(
+            *[_cached_id_map(source, s3, semaphore) for source in state_sources],
+            return_exceptions=True
+        )
+
     managed_ids = set()
+    for source, result in zip(state_sources, results):
+        if isinstance(result, BaseException):
+            # Log but continue - don't fail if one state is unreadable
+            print(f"Warning: Failed to load {source}: {result!r}")
+            continue
+        managed_ids.update(map(sys.intern, result))  # dedupe across states
 
-    for source in state_sources:
-        try:
-            parser = TerraformStateParser()
+    return frozenset(managed_ids)
 
-            if source.startswith("s3://"):
-                state_json = await _fetch_state_from_s3(source)
-                parser.load_from_json(state_json)
-            else:
-                parser.load_from_file(source)
 
-            id_map = parser.build_id_map()
-            managed_ids.update(id_map.keys())
+async def _cached_id_map(source: str, s3, semaphore: asyncio.Semaphore) -> frozenset[str]:
+    """Load one state source's managed IDs, via disk cache"""
+    async with semaphore:
+        if source.startswith("s3://"):
+            return await _cached_s3_ids(s3, source)
 
-        except Exception as e:
-            # Log but continue - don't fail if one state is unreadable
-            print(f"Warning: Failed to load {source}: {e}")
+        # Stat, cache and parse all block on disk
+        return await asyncio.to_thread(_cached_local_ids, source)
+
+
+async def _cached_s3_ids(s3, source: str) -> frozenset[str]:
+    """S3 state IDs, cached by object ETag"""
+    bucket, key = _split_s3_uri(source)
+    head = await asyncio.wait_for(
+        s3.head_object(Bucket=bucket, Key=key), STATE_FETCH_TIMEOUT
+    )
+    cache_path = id_cache.cache_path(source, head["ETag"])
+
+    managed_ids = await asyncio.to_thread(id_cache.read_ids, cache_path)
+    if managed_ids is None:
+        state_bytes = await asyncio.wait_for(
+            _fetch_state_from_s3(s3, source), STATE_FETCH_TIMEOUT
+        )
+        managed_ids = await asyncio.to_thread(_parse_state_bytes, state_bytes)
+        await asyncio.to_thread(id_cache.write_ids, cache_path, managed_ids)
 
     return managed_ids
 
 
-async def _fetch_state_from_s3(s3_uri: str) -> str:
-    """Fetch Terraform state from S3"""
-    # Parse s3://bucket/key
+def _cached_local_ids(source: str) -> frozenset[str]:
+    """Local state IDs, cached by path, mtime and size"""
+    path = os.path.abspath(source)  # one slot per file
+    stat = os.stat(path)
+    cache_path = id_cache.cache_path(path, f"{stat.st_mtime_ns}:{stat.st_size}")
+
+    managed_ids = id_cache.read_ids(cache_path)
+    if managed_ids is None:
+        managed_ids = _load_local_ids(path)
+        id_cache.write_ids(cache_path, managed_ids)
+
+    return managed_ids
+
+
+def _load_local_ids(path: str) -> frozenset[str]:
+    """Stream one local state file into managed IDs"""
+    return TerraformStateParser.ids_in_file(path)
+
+
+def _parse_state_bytes(state_bytes: bytes) -> frozenset[str]:
+    """Managed IDs from raw state JSON"""
+    return frozenset(TerraformStateParser.parse_json(state_bytes).id_map)
+
+
+def _split_s3_uri(s3_uri: str) -> tuple[str, str]:
+    """Split s3://bucket/key, defaulting the key"""
     parts = s3_uri.replace("s3://", "").split("/", 1)
     bucket = parts[0]
     if len(parts) < 2 or parts[1].strip() == '':
         key = 'terraform.tfstate'
     else:
         key = parts[1]
+    return bucket, key
+
 
-    async with aioboto3.client('s3') as s3:
-        response = await s3.get_object(Bucket=bucket, Key=key)
-    return response["Body"].read().decode("utf-8")
+async def _fetch_state_from_s3(s3, s3_uri: str) -> bytes:
+    """Fetch Terraform state from S3"""
+    bucket, key = _split_s3_uri(s3_uri)
+
+    response = await s3.get_object(Bucket=bucket, Key=key)
+    async with response["Body"] as body:
+        return await body.read()  # orjson parses bytes
+
+
+async def _coalesce(key: tuple, factory):
+    """Share one in-flight call among identical requests"""
+    key = (asyncio.get_running_loop(), *key)
+    future = _in_flight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(factory())
+        _in_flight[key] = future
+        future.add_done_callback(
+            lambda done: _in_flight.pop(key) if _in_flight.get(key) is done else None
+        )
+
+    # Shield: one caller cancelling must not cancel the rest
+    return await asyncio.shield(future)
 
 
 async def _fetch_aws_resources(region: str, resource_types: list[str]) -> list[dict]:
     """Fetch all resources of specified types from AWS"""
-    resources = []
+    resources = await _coalesce(
+        ("resources", region, frozenset(resource_types)),
+        lambda: _scan_aws_resources(region, resource_types)
+    )
+    return [dict(r) for r in resources]  # callers annotate their copy
 
-    if "ec2" in resource_types:
-        resources.extend(await _fetch_ec2_instances(region))
 
-    if "rds" in resource_types:
-        resources.extend(await _fetch_rds_instances(region))
+async def _scan_aws_resources(region: str, resource_types: list[str]) -> list[dict]:
+    """Scan AWS for resources of the given types"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCANS)
 
-    if "s3" in resource_types:
-        resources.extend(await _fetch_s3_buckets(region))
+    async def _scan(fetcher) -> list[dict]:
+        # Sync boto3 paginators run off the event loop
+        async with semaphore:
+            return await asyncio.to_thread(fetcher, region)
 
-    return resources
+    fetchers = [
+        FETCHERS[resource_type]
+        for resource_type in ("ec2", "rds", "s3")
+        if resource_type in resource_types
+    ]
+    results = await asyncio.gather(*[_scan(f) for f in fetchers])
+    return list(chain.from_iterable(results))
 
 
-async def _fetch_ec2_instances(region: str) -> list[dict]:
+def _fetch_ec2_instances_sync(region: str) -> list[dict]:
     """Fetch all EC2 instances with dependency info"""
-    ec2 = boto3.client("ec2", region_name=region)
-    resources = []
-
+    ec2 = get_client(None, region, "ec2")
     paginator = ec2.get_paginator("describe_instances")
-    for page in paginator.paginate():
-        for reservation in page["Reservations"]:
-            for instance in reservation["Instances"]:
-                if instance["State"]["Name"] == "terminated":
-                    continue
-
-                tags = {t["Key"]: t["Value"] for t in instance.get("Tags", [])}
-
-                # Dependency info for recommendations
-                volumes = [b["Ebs"]["VolumeId"] for b in instance.get("BlockDeviceMappings", []) if "Ebs" in b]
-                security_groups = [sg["GroupId"] for sg in instance.get("SecurityGroups", [])]
-                has_public_ip = instance.get("PublicIpAddress") is not None
-                has_elastic_ip = any(
-                    ni.get("Association", {}).get("IpOwnerId") != "amazon"
-                    for ni in instance.get("NetworkInterfaces", [])
-                    if "Association" in ni
-                )
-
-                resources.append({
-                    "resource_id": instance["InstanceId"],
-                    "resource_type": "ec2",
-                    "name": tags.get("Name", ""),
-                    "instance_type": instance.get("InstanceType"),
-                    "state": instance["State"]["Name"],
-                    "launch_time": instance["LaunchTime"].isoformat(),
-                    "tags": tags,
-                    # Dependency fields
-                    "attached_volumes": volumes,
-                    "security_groups": security_groups,
-                    "has_public_ip": has_public_ip,
-                    "has_elastic_ip": has_elastic_ip,
-                })
-
-    return resources
-
-
-async def _fetch_rds_instances(region: str) -> list[dict]:
-    """Fetch all RDS instances with dependency info"""
-    rds = boto3.client("rds", region_name=region)
-    resources = []
 
+    return [
+        _ec2_record(instance)
+        for page in paginator.paginate()
+        for reservation in page["Reservations"]
+        for instance in reservation["Instances"]
+        if instance["State"]["Name"] != "terminated"
+    ]
+
+
+def _ec2_record(instance: dict) -> dict:
+    """Shape one EC2 instance for orphan reporting"""
+    tags = tags_to_dict(instance.get("Tags", []))
+
+    # Dependency info for recommendations
+    volumes = [b["Ebs"]["VolumeId"] for b in instance.get("BlockDeviceMappings", []) if "Ebs" in b]
+    security_groups = [sg["GroupId"] for sg in instance.get("SecurityGroups", [])]
+    has_public_ip = instance.get("PublicIpAddress") is not None
+    has_elastic_ip = any(
+        ni.get("Association", {}).get("IpOwnerId") != "amazon"
+        for ni in instance.get("NetworkInterfaces", [])
+        if "Association" in ni
+    )
+
+    return {
+        "resource_id": sys.intern(instance["InstanceId"]),
+        "resource_type": "ec2",
+        "name": tags.get("Name", ""),
+        "instance_type": instance.get("InstanceType"),
+        "state": instance["State"]["Name"],
+        "launch_time": _isoformat(instance["LaunchTime"]),
+        "tags": tags,
+        # Dependency fields
+        "attached_volumes": volumes,
+        "security_groups": security_groups,
+        "has_public_ip": has_public_ip,
+        "has_elastic_ip": has_elastic_ip,
+    }
+
+
+def _fetch_rds_instances_sync(region: str) -> list[dict]:
+    """Fetch all RDS instances with dependency info"""
+    rds = get_client(None, region, "rds")
     paginator = rds.get_paginator("describe_db_instances")
-    for page in paginator.paginate():
-        for db in page["DBInstances"]:
-            # Dependency info
-            has_snapshots = db.get("LatestRestorableTime") is not None
-            has_replicas = len(db.get("ReadReplicaDBInstanceIdentifiers", [])) > 0
-            is_replica = db.get("ReadReplicaSourceDBInstanceIdentifier") is not None
-            is_public = db.get("PubliclyAccessible", False)
-
-            resources.append({
-                "resource_id": db["DBInstanceIdentifier"],
-                "resource_type": "rds",
-                "name": db["DBInstanceIdentifier"],
-                "engine": db["Engine"],
-                "instance_class": db["DBInstanceClass"],
-                "state": db["DBInstanceStatus"],
-                "tags": {},
-                # Dependency fields
-                "has_snapshots": has_snapshots,
-                "has_replicas": has_replicas,
-                "is_replica": is_replica,
-                "is_public": is_public,
-            })
-
-    return resources
-
-
-async def _fetch_s3_buckets(region: str) -> list[dict]:
+
+    return [
+        _rds_record(db)
+        for page in paginator.paginate()
+        for db in page["DBInstances"]
+    ]
+
+
+def _rds_record(db: dict) -> dict:
+    """Shape one RDS instance for orphan reporting"""
+    # Dependency info
+    has_snapshots = db.get("LatestRestorableTime") is not None
+    has_replicas = len(db.get("ReadReplicaDBInstanceIdentifiers", [])) > 0
+    is_replica = db.get("ReadReplicaSourceDBInstanceIdentifier") is not None
+    is_public = db.get("PubliclyAccessible", False)
+
+    return {
+        "resource_id": sys.intern(db["DBInstanceIdentifier"]),
+        "resource_type": "rds",
+        "name": db["DBInstanceIdentifier"],
+        "engine": db["Engine"],
+        "instance_class": db["DBInstanceClass"],
+        "state": db["DBInstanceStatus"],
+        "tags": {},
+        # Dependency fields
+        "has_snapshots": has_snapshots,
+        "has_replicas": has_replicas,
+        "is_replica": is_replica,
+        "is_public": is_public,
+    }
+
+
+def _fetch_s3_buckets_sync(region: str) -> list[dict]:
     """Fetch all S3 buckets with access info"""
-    s3 = boto3.client("s3", region_name=region)
-    resources = []
+    s3 = get_client(None, region, "s3")
 
     response = s3.list_buckets()
-    for bucket in response.get("Buckets", []):
-        bucket_name = bucket["Name"]
+    buckets = response.get("Buckets", [])
+
+    # boto3 clients are thread-safe; pool caps S3 load
+    with ThreadPoolExecutor(max_workers=MAX_BUCKET_WORKERS) as pool:
+        regions = pool.map(lambda b: _bucket_region(s3, b["Name"]), buckets)
+        local = [b for b, r in zip(buckets, regions) if r == region]
+
+        counts = _fetch_bucket_object_counts(region, [b["Name"] for b in local])
+        return list(pool.map(
+            lambda b: _describe_bucket(s3, b, counts.get(b["Name"])), local
+        ))
+
 
+def _fetch_bucket_object_counts(region: str, bucket_names: list[str]) -> dict[str, int]:
+    """Latest NumberOfObjects per bucket from CloudWatch"""
+    if not bucket_names:
+        return {}
+
+    cloudwatch = get_client(None, region, "cloudwatch")
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=2)  # storage metrics are daily
+
+    counts = {}
+    try:
+        for offset in range(0, len(bucket_names), CW_QUERY_CHUNK):
+            chunk = bucket_names[offset:offset + CW_QUERY_CHUNK]
+            queries = [
+                {
+                    "Id": f"b{i}",
+                    "MetricStat": {
+                        "Metric": {
+                            "Namespace": "AWS/S3",
+                            "MetricName": "NumberOfObjects",
+                            "Dimensions": [
+                                {"Name": "BucketName", "Value": name},
+                                {"Name": "StorageType", "Value": "AllStorageTypes"},
+                            ]
+                        },
+                        "Period": 86400,
+                        "Stat": "Average"
+                    }
+                }
+                for i, name in enumerate(chunk)
+            ]
+
+            paginator = cloudwatch.get_paginator("get_metric_data")
+            for page in paginator.paginate(
+                MetricDataQueries=queries, StartTime=start, EndTime=end,
+                ScanBy="TimestampDescending"
+            ):
+                for result in page.get("MetricDataResults", []):
+                    name = chunk[int(result["Id"][1:])]
+                    if result.get("Values") and name not in counts:
+                        counts[name] = int(result["Values"][0])  # newest first
+    except Exception:
+        pass  # fall back to per-bucket listing
+
+    return counts
+
+
+def _bucket_region(s3, bucket_name: str) -> Optional[str]:
+    """Read bucket region from a HeadBucket response"""
+    try:
+        response = s3.head_bucket(Bucket=bucket_name)
+    except ClientError as e:
+        # Wrong-region 301s still carry the header
+        response = e.response
+    except BotoCoreError:
+        return None  # skip bucket, keep the scan
+
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    return headers.get("x-amz-bucket-region")
+
+
+def _describe_bucket(s3, bucket: dict, object_count: Optional[int] = None) -> dict:
+    """Describe one in-region bucket"""
+    bucket_name = bucket["Name"]
+
+    # Check recent access and object count
+    is_empty = False
+    recently_accessed = False
+    if not object_count:
+        # Zero may be stale, or no metric yet: probe
         try:
-            loc = s3.get_bucket_location(Bucket=bucket_name)
-            bucket_region = loc.get("LocationConstraint") or "us-east-1"
-
-            if bucket_region != region:
-                continue
-
-            # Check recent access and object count
-            is_empty = False
-            recently_accessed = False
-            try:
-                objects = s3.list_objects_v2(Bucket=bucket_name, MaxKeys=1)
-                is_empty = objects.get("KeyCount", 0) == 0
-            except Exception:
-                pass
-
-            # Check if versioning enabled (indicates active use)
-            has_versioning = False
-            try:
-                ver = s3.get_bucket_versioning(Bucket=bucket_name)
-                has_versioning = ver.get("Status") == "Enabled"
-            except Exception:
-                pass
-
-            resources.append({
-                "resource_id": bucket_name,
-                "resource_type": "s3",
-                "name": bucket_name,
-                "created": bucket["CreationDate"].isoformat(),
-                "tags": {},
-                # Dependency fields
-                "is_empty": is_empty,
-                "has_versioning": has_versioning,
-            })
+            objects = s3.list_objects_v2(Bucket=bucket_name, MaxKeys=1)
+            is_empty = objects.get("KeyCount", 0) == 0
         except Exception:
-            continue
+            pass
+
+    # Check if versioning enabled (indicates active use)
+    has_versioning = False
+    try:
+        ver = s3.get_bucket_versioning(Bucket=bucket_name)
+        has_versioning = ver.get("Status") == "Enabled"
+    except Exception:
+        pass
+
+    return {
+        "resource_id": sys.intern(bucket_name),
+        "resource_type": "s3",
+        "name": bucket_name,
+        "created": _isoformat(bucket["CreationDate"]),
+        "tags": {},
+        # Dependency fields
+        "is_empty": is_empty,
+        "has_versioning": has_versioning,
+    }
+
 
-    return resources
+FETCHERS = {
+    "ec2": _fetch_ec2_instances_sync,
+    "rds": _fetch_rds_instances_sync,
+    "s3": _fetch_s3_buckets_sync,
+}
 
 
 async def _fetch_costs(region: str, resource_ids: list[str]) -> dict[str, float]:
@@ -243,34 +466,35 @@ async def _fetch_costs(region: str, resource_ids: list[str]) -> dict[str, float]
     if not resource_ids:
         return {}
 
+    costs = await _coalesce(
+        ("costs", region, tuple(resource_ids)),
+        lambda: _query_costs(region, resource_ids)
+    )
+    return dict(costs)
+
+
+async def _query_costs(region: str, resource_ids: list[str]) -> dict[str, float]:
+    """Query Cost Explorer in chunks and sum per resource"""
     try:
-        ce = boto3.client("ce", region_name="us-east-1")  # CE is global
+        ce = get_client(None, "us-east-1", "ce")  # CE is global
 
         end = datetime.now()
         start = end - timedelta(days=30)
 
-        response = ce.get_cost_and_usage(
-            TimePeriod={
-                "Start": start.strftime("%Y-%m-%d"),
-                "End": end.strftime("%Y-%m-%d")
-            },
-            Granularity="MONTHLY",
-            Metrics=["UnblendedCost"],
-            GroupBy=[{"Type": "DIMENSION", "Key": "RESOURCE_ID"}],
-            Filter={
-                "Dimensions": {
-                    "Key": "RESOURCE_ID",
-                    "Values": resource_ids
-                }
-            }
-        )
+        # CE caps filter values; query in chunks
+        chunks = [
+            resource_ids[i:i + CE_FILTER_CHUNK]
+            for i in range(0, len(resource_ids), CE_FILTER_CHUNK)
+        ]
+        chunk_costs = await asyncio.gather(*[
+            asyncio.to_thread(_ce_one_chunk, ce, start, end, chunk)
+            for chunk in chunks
+        ])
 
         costs = {}
-        for result in response.get("ResultsByTime", []):
-            for group in result.get("Groups", []):
-                resource_id = group["Keys"][0]
-                amount = float(group["Metrics"]["UnblendedCost"]["Amount"])
-                costs[resource_id] = costs.get(resource_id, 0) + amount
+        for chunk_cost in chunk_costs:
+            for resource_id, amount in chunk_cost.items():
+                costs[resource_id] = costs.get(resource_id, 0.0) + amount
 
         return costs
 
@@ -280,73 +504,104 @@ async def _fetch_costs(region: str, resource_ids: list[str]) -> dict[str, float]
         return {}
 
 
+def _ce_one_chunk(ce, start: datetime, end: datetime, resource_ids: list[str]) -> dict[str, float]:
+    """Query Cost Explorer for one chunk of resource IDs"""
+    response = ce.get_cost_and_usage(
+        TimePeriod={
+            "Start": start.strftime("%Y-%m-%d"),
+            "End": end.strftime("%Y-%m-%d")
+        },
+        Granularity="MONTHLY",
+        Metrics=["UnblendedCost"],
+        GroupBy=[{"Type": "DIMENSION", "Key": "RESOURCE_ID"}],
+        Filter={
+            "Dimensions": {
+                "Key": "RESOURCE_ID",
+                "Values": resource_ids
+            }
+        }
+    )
+
+    costs = {}
+    for result in response.get("ResultsByTime", []):
+        for group in result.get("Groups", []):
+            resource_id = group["Keys"][0]
+            amount = float(group["Metrics"]["UnblendedCost"]["Amount"])
+            costs[resource_id] = costs.get(resource_id, 0) + amount
+
+    return costs
+
+
+@dataclass(slots=True, frozen=True)
+class _RecommendationFacts:
+    """Fields the recommendation rules depend on"""
+    resource_type: Optional[str]
+    state: Optional[str]
+    attached_volumes: int
+    has_elastic_ip: bool
+    has_replicas: bool
+    is_replica: bool
+    is_empty: bool
+    has_versioning: bool
+
+
+def _has_ec2_dependencies(facts: _RecommendationFacts) -> bool:
+    """Attached volumes or an Elastic IP"""
+    return bool(facts.attached_volumes or facts.has_elastic_ip)
+
+
+# (predicate, confidence, action, reason); later matches win
+RECOMMENDATION_RULES = {
+    "ec2": (
+        (lambda f: f.attached_volumes, "medium", "Review dependencies",
+         lambda f: f"{f.attached_volumes} attached volumes"),
+        (lambda f: f.has_elastic_ip, "medium", "Review dependencies",
+         "Has Elastic IP"),
+        (lambda f: f.state == "running", "low", "Investigate usage",
+         "Instance is running"),
+        (lambda f: f.state == "stopped" and not _has_ec2_dependencies(f),
+         "high", "Safe to delete", "Stopped with no volumes"),
+    ),
+    "rds": (
+        (lambda f: f.has_replicas, "low", "Review dependencies",
+         "Has read replicas"),
+        (lambda f: f.is_replica, "medium", "Review dependencies",
+         "Is a read replica"),
+        (lambda f: f.state == "available", "low", "Investigate usage",
+         "Database is running"),
+        (lambda f: f.state == "stopped", "medium", "Review before delete",
+         "Database is stopped"),
+    ),
+    "s3": (
+        (lambda f: f.is_empty, "high", "Safe to delete",
+         "Bucket is empty"),
+        (lambda f: not f.is_empty, "medium", "Review contents",
+         "Bucket has objects"),
+        (lambda f: f.has_versioning, "low", "Investigate usage",
+         "Versioning enabled"),
+    ),
+}
+
+
+def _generate_recommendations(resources: list[dict]) -> list[dict]:
+    """Generate recommendations for a batch of resources"""
+    return [_generate_recommendation(resource) for resource in resources]
+
+
 def _generate_recommendation(resource: dict) -> dict:
     """Generate deletion recommendation based on resource state"""
-    resource_type = resource.get("resource_type")
-    confidence = "high"
-    action = "Safe to delete"
-    reasons = []
-
-    if resource_type == "ec2":
-        has_dependencies = False
-
-        if resource.get("attached_volumes"):
-            has_dependencies = True
-            confidence = "medium"
-            action = "Review dependencies"
-            reasons.append(f"{len(resource['attached_volumes'])} attached volumes")
-
-        if resource.get("has_elastic_ip"):
-            has_dependencies = True
-            confidence = "medium"
-            action = "Review dependencies"
-            reasons.append("Has Elastic IP")
-
-        if resource.get("state") == "running":
-            confidence = "low"
-            action = "Investigate usage"
-            reasons.append("Instance is running")
-        elif resource.get("state") == "stopped":
-            if not has_dependencies:
-                confidence = "high"
-                action = "Safe to delete"
-                reasons.append("Stopped with no volumes")
-
-    elif resource_type == "rds":
-        if resource.get("has_replicas"):
-            confidence = "low"
-            action = "Review dependencies"
-            reasons.append("Has read replicas")
-
-        if resource.get("is_replica"):
-            confidence = "medium"
-            action = "Review dependencies"
-            reasons.append("Is a read replica")
-
-        if resource.get("state") == "available":
-            confidence = "low"
-            action = "Investigate usage"
-            reasons.append("Database is running")
-
-        if resource.get("state") == "stopped":
-            confidence = "medium"
-            action = "Review before delete"
-            reasons.append("Database is stopped")
-
-    elif resource_type == "s3":
-        if resource.get("is_empty"):
-            confidence = "high"
-            action = "Safe to delete"
-            reasons.append("Bucket is empty")
-        else:
-            confidence = "medium"
-            action = "Review contents"
-            reasons.append("Bucket has objects")
-
-        if resource.get("has_versioning"):
-            confidence = "low"
-            action = "Investigate usage"
-            reasons.append("Versioning enabled")
+    facts = _RecommendationFacts(
+        resource_type=resource.get("resource_type"),
+        state=resource.get("state"),
+        attached_volumes=len(resource.get("attached_volumes") or ()),
+        has_elastic_ip=bool(resource.get("has_elastic_ip")),
+        has_replicas=bool(resource.get("has_replicas")),
+        is_replica=bool(resource.get("is_replica")),
+        is_empty=bool(resource.get("is_empty")),
+        has_versioning=bool(resource.get("has_versioning")),
+    )
+    confidence, action, rule_reasons = _apply_rules(facts)
+    reasons = list(rule_reasons)
 
     # Cost consideration
     monthly_cost = resource.get("monthly_cost", 0)
@@ -360,3 +615,21 @@ def _generate_recommendation(resource: dict) -> dict:
         "action": action,
         "reasons": reasons
     }
+
+
+@lru_cache(maxsize=4096)
+def _apply_rules(facts: _RecommendationFacts) -> tuple[str, str, tuple[str, ...]]:
+    """Rule outcome; fleets of identical shapes hit cache"""
+    confidence = "high"
+    action = "Safe to delete"
+    reasons = []
+
+    for predicate, rule_confidence, rule_action, reason in RECOMMENDATION_RULES.get(
+        facts.resource_type, ()
+    ):
+        if predicate(facts):
+            confidence = rule_confidence
+            action = rule_action
+            reasons.append(reason(facts) if callable(reason) else reason)
+
+    return confidence, action, tuple(reasons)
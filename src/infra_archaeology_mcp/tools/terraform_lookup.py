@@ -2,14 +2,28 @@
 
 import re
 import os
-import boto3
+import asyncio
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 from dataclasses import dataclass
 
-from infra_archaeology_mcp.terraform.state_parser import TerraformStateParser
+from botocore.exceptions import ClientError
+from cachetools import LRUCache
 
+from infra_archaeology_mcp.aws.session import CLIENT_CONFIG, get_async_session
+from infra_archaeology_mcp.terraform.state_parser import (
+    MAX_CACHED_STATES,
+    STREAM_THRESHOLD_BYTES,
+    ParsedState,
+    TerraformStateParser,
+)
+
+
+MAX_CONCURRENT_SEARCHES = 16  # stay under S3 throttling
+
+# s3_uri -> (ETag, LastModified, ParsedState)
+_s3_states = LRUCache(maxsize=MAX_CACHED_STATES)
 
 # Extensible service patterns for ARN/ID parsing
 # Order matters for bare ID matching: most specific patterns first
@@ -32,17 +46,60 @@ SERVICE_PATTERNS = {
 }
 
 
+def _compile_identifier_re() -> tuple[re.Pattern, dict[str, tuple[str, int, frozenset[str]]]]:
+    """One regex for all ARN then ID forms, plus dispatch"""
+    alternatives = [
+        (f"{service}_{kind}", service, patterns[f"{kind}_pattern"])
+        for kind in ("arn", "id")  # ARNs take precedence
+        for service, patterns in SERVICE_PATTERNS.items()
+    ]
+    pattern = re.compile("|".join(
+        f"(?P<{name}>{regex})" for name, _, regex in alternatives
+    ))
+
+    # group name -> (service, nested ID group, terraform types)
+    dispatch = {
+        name: (
+            service,
+            pattern.groupindex[name] + 1,
+            frozenset(SERVICE_PATTERNS[service]["terraform_types"])
+        )
+        for name, service, _ in alternatives
+    }
+    return pattern, dispatch
+
+
+# Alternation order keeps the ARN-then-ID, dict-order precedence
+_IDENTIFIER_RE, _IDENTIFIER_DISPATCH = _compile_identifier_re()
+
+# Bare IDs can fit several services (lowercase RDS looks like S3)
+_BARE_ID_TYPES = [
+    (re.compile(patterns["id_pattern"]), frozenset(patterns["terraform_types"]))
+    for patterns in SERVICE_PATTERNS.values()
+]
+
+_ENV_RE = re.compile(r"env:([^/]+)")
+_WORKSPACE_RES = [
+    re.compile(pattern) for pattern in (
+        r"/workspaces?/([^/]+)/",
+        r"/env(?:ironment)?s?/([^/]+)/",
+        r"/([^/]+)/terraform\.tfstate$",
+    )
+]
+_GENERIC_WORKSPACES = frozenset({"terraform", "state", "tfstate", "states"})
+
+
 class UnsupportedResourceError(Exception):
     """Resource type not supported"""
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResourceIdentifier:
     """Parsed resource identifier"""
     service: str
     resource_id: str
-    terraform_types: list[str]
+    terraform_types: frozenset[str]
     original_input: str
 
 
@@ -50,27 +107,21 @@ def parse_resource_identifier(resource_input: str) -> ResourceIdentifier:
     """Parse ARN or bare ID into service + resource_id"""
     resource_input = resource_input.strip()
 
-    # Try ARN patterns first
-    for service, patterns in SERVICE_PATTERNS.items():
-        match = re.match(patterns["arn_pattern"], resource_input)
-        if match:
-            return ResourceIdentifier(
-                service=service,
-                resource_id=match.group(1),
-                terraform_types=patterns["terraform_types"],
-                original_input=resource_input
-            )
-
-    # Try bare ID patterns
-    for service, patterns in SERVICE_PATTERNS.items():
-        match = re.match(patterns["id_pattern"], resource_input)
-        if match:
-            return ResourceIdentifier(
-                service=service,
-                resource_id=match.group(1),
-                terraform_types=patterns["terraform_types"],
-                original_input=resource_input
-            )
+    # Single match covers ARN patterns, then bare IDs
+    match = _IDENTIFIER_RE.match(resource_input)
+    if match:
+        service, id_group, terraform_types = _IDENTIFIER_DISPATCH[match.lastgroup]
+        if not match.lastgroup.endswith("_arn"):
+            # Search every service the bare ID could be
+            terraform_types = frozenset().union(*(
+                types for regex, types in _BARE_ID_TYPES if regex.match(resource_input)
+            ))
+        return ResourceIdentifier(
+            service=service,
+            resource_id=match.group(id_group),
+            terraform_types=terraform_types,
+            original_input=resource_input
+        )
 
     raise UnsupportedResourceError(f"Cannot parse: {resource_input}")
 
@@ -102,7 +153,7 @@ async def discover_state_files(
         auto_states = await _discover_s3_states(discovery_config)
         found_states.extend(auto_states)
 
-    return list(set(found_states))  # dedupe
+    return list(dict.fromkeys(found_states))  # dedupe, keep order
 
 
 async def _discover_local_states() -> list[str]:
@@ -123,7 +174,8 @@ async def what_terraform_owns_resource(
     resource_arn: str,
     state_sources: Optional[list[str]] = None,
     discovery_mode: str = "hybrid",
-    discovery_config: Optional[dict] = None
+    discovery_config: Optional[dict] = None,
+    conflict_detection: bool = True
 ) -> dict:
     """
     Check if AWS resource is Terraform-managed, return ownership details.
@@ -133,6 +185,7 @@ async def what_terraform_owns_resource(
         state_sources: Explicit state locations (S3 URIs, local paths, TFC paths)
         discovery_mode: "explicit", "local", "auto", or "hybrid"
         discovery_config: Config for auto-discovery (S3 bucket patterns, etc.)
+        conflict_detection: Search every state; False stops at first match
 
     Returns:
         terraform_managed: bool
@@ -166,12 +219,8 @@ async def what_terraform_owns_resource(
             "error": "No state files found"
         }
 
-    # Search each state file
-    matches = []
-    for state_location in state_files:
-        match = await _search_state_file(state_location, identifier)
-        if match:
-            matches.append(match)
+    # Search state files concurrently
+    matches = await _search_state_files(state_files, identifier, conflict_detection)
 
     # Build response
     if not matches:
@@ -200,16 +249,44 @@ async def what_terraform_owns_resource(
     return result
 
 
+async def _search_state_files(
+    state_files: list[str],
+    identifier: ResourceIdentifier,
+    conflict_detection: bool
+) -> list[dict]:
+    """Search states concurrently, optionally stopping early"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+    async def _search(state_location: str) -> Optional[dict]:
+        async with semaphore:
+            return await _search_state_file(state_location, identifier)
+
+    tasks = [asyncio.create_task(_search(loc)) for loc in state_files]
+
+    if conflict_detection:
+        results = await asyncio.gather(*tasks)
+        return [match for match in results if match]
+
+    try:
+        for next_match in asyncio.as_completed(tasks):
+            match = await next_match
+            if match:
+                return [match]
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()  # no-op for finished tasks
+
+
 async def _search_state_file(state_location: str, identifier: ResourceIdentifier) -> Optional[dict]:
     """Search single state file for resource"""
     try:
-        parser = TerraformStateParser()
         last_modified = None
 
-        # Load state based on location type
+        # Load state and search for resource
         if state_location.startswith("s3://"):
-            state_json, last_modified = await _load_state_from_s3(state_location)
-            parser.load_from_json(state_json)
+            state, last_modified = await _load_state_from_s3(state_location)
+            resource = state.find(identifier.resource_id, identifier.terraform_types)
         elif state_location.startswith("app.terraform.io/"):
             # TFC support - not implemented yet
             return None
@@ -220,11 +297,20 @@ async def _search_state_file(state_location: str, identifier: ResourceIdentifier
                 state_path = state_path / "terraform.tfstate"
             if not state_path.exists():
                 return None
-            parser.load_from_file(str(state_path))
-            last_modified = datetime.fromtimestamp(state_path.stat().st_mtime)
+            stat = state_path.stat()
+            if stat.st_size > STREAM_THRESHOLD_BYTES:
+                # Stream; stop parsing once the resource is found
+                resource = await asyncio.to_thread(
+                    TerraformStateParser.find_in_file,
+                    str(state_path), identifier.resource_id, identifier.terraform_types
+                )
+            else:
+                state = await asyncio.to_thread(
+                    TerraformStateParser.parse_file, str(state_path)
+                )
+                resource = state.find(identifier.resource_id, identifier.terraform_types)
+            last_modified = datetime.fromtimestamp(stat.st_mtime)
 
-        # Search for resource
-        resource = parser.find_by_id(identifier.resource_id)
         if not resource:
             return None
 
@@ -233,13 +319,13 @@ async def _search_state_file(state_location: str, identifier: ResourceIdentifier
 
         return {
             "resource_id": identifier.resource_id,
-            "terraform_address": resource["address"],
-            "resource_type": resource["type"],
-            "module": resource.get("module"),
+            "terraform_address": resource.address,
+            "resource_type": resource.type,
+            "module": resource.module,
             "workspace": workspace,
             "state_location": state_location,
             "last_applied": last_modified.isoformat() if last_modified else None,
-            "attributes": resource.get("attributes", {})
+            "attributes": resource.attributes
         }
 
     except Exception as e:
@@ -247,18 +333,34 @@ async def _search_state_file(state_location: str, identifier: ResourceIdentifier
         return None
 
 
-async def _load_state_from_s3(s3_uri: str) -> tuple[str, Optional[datetime]]:
-    """Load state file from S3, return content and last modified"""
+async def _load_state_from_s3(s3_uri: str) -> tuple[ParsedState, Optional[datetime]]:
+    """Load parsed state from S3, reused while ETag matches"""
     parts = s3_uri.replace("s3://", "").split("/", 1)
     bucket = parts[0]
     key = parts[1] if len(parts) > 1 else "terraform.tfstate"
 
-    s3 = boto3.client("s3")
-    response = s3.get_object(Bucket=bucket, Key=key)
-    content = response["Body"].read().decode("utf-8")
+    cached = _s3_states.get(s3_uri)
+    conditional = {"IfNoneMatch": cached[0]} if cached else {}
+
+    async with get_async_session().client("s3", config=CLIENT_CONFIG) as s3:
+        try:
+            response = await s3.get_object(Bucket=bucket, Key=key, **conditional)
+        except ClientError as e:
+            # 304: unchanged, reuse the parsed index
+            if cached and e.response["Error"]["Code"] == "304":
+                return cached[2], cached[1]
+            raise
+        async with response["Body"] as body:
+            content = await body.read()
+
+    state = await asyncio.to_thread(TerraformStateParser.parse_json, content)
     last_modified = response.get("LastModified")
+    if len(content) <= STREAM_THRESHOLD_BYTES:
+        _s3_states[s3_uri] = (response["ETag"], last_modified, state)
+    else:
+        _s3_states.pop(s3_uri, None)  # too big to pin in memory
 
-    return content, last_modified
+    return state, last_modified
 
 
 def _extract_workspace(state_location: str) -> str:
@@ -273,23 +375,17 @@ def _extract_workspace(state_location: str) -> str:
 
     # Check for env: prefix pattern
     if "env:" in path:
-        match = re.search(r"env:([^/]+)", path)
+        match = _ENV_RE.search(path)
         if match:
             return match.group(1)
 
     # Check for common directory patterns
-    patterns = [
-        r"/workspaces?/([^/]+)/",
-        r"/env(?:ironment)?s?/([^/]+)/",
-        r"/([^/]+)/terraform\.tfstate$",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, path)
+    for pattern in _WORKSPACE_RES:
+        match = pattern.search(path)
         if match:
             workspace = match.group(1)
             # Skip generic names
-            if workspace not in ["terraform", "state", "tfstate", "states"]:
+            if workspace not in _GENERIC_WORKSPACES:
                 return workspace
 
     return "default"
@@ -0,0 +1,40 @@
+"""Tests for CloudTrail creation lookups"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from infra_archaeology_mcp.aws.cloudtrail import CloudTrailClient, ParsedEvent
+
+EVENT = ParsedEvent(
+    creator="alice",
+    created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    event_name="StartInstances",
+    source_ip="10.0.0.1",
+    user_agent="aws-cli",
+    event_id="evt-1",
+)
+
+
+class TestFindCreateEvent:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("matched", [True, False])
+    async def test_cache_fallbacks_briefly(self, matched):
+        """Only real creation events get the long TTL"""
+        with patch("infra_archaeology_mcp.aws.cloudtrail.get_async_session"):
+            client = CloudTrailClient()
+
+        with patch.object(
+            client, "_lookup_create_event", AsyncMock(return_value=(EVENT, matched))
+        ) as mock_lookup:
+            for _ in range(2):
+                assert (
+                    await client.find_create_event("i-123", {"RunInstances"}) == EVENT
+                )
+
+        mock_lookup.assert_awaited_once()
+        assert (len(client._cache), len(client._miss_cache)) == (
+            (1, 0) if matched else (0, 1)
+        )
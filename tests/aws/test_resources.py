@@ -0,0 +1,18 @@
+"""Tests for AWS response helpers"""
+
+from infra_archaeology_mcp.aws.resources import tags_to_dict
+
+
+class TestTagsToDict:
+
+    def test_convert_tag_list(self):
+        """Convert AWS Key/Value tag list to dict"""
+        tags = [
+            {"Key": "Name", "Value": "web-server"},
+            {"Key": "env", "Value": "prod"},
+        ]
+        assert tags_to_dict(tags) == {"Name": "web-server", "env": "prod"}
+
+    def test_convert_empty_tags(self):
+        """Empty tag list returns empty dict"""
+        assert tags_to_dict([]) == {}
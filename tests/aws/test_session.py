@@ -0,0 +1,44 @@
+"""Tests for cached AWS clients"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from infra_archaeology_mcp.aws import session
+
+
+class TestGetClient:
+
+    def test_create_clients_one_at_a_time(self):
+        """Serialize cold client creation across threads"""
+        active = 0
+        peak = 0
+        counter_lock = threading.Lock()
+
+        class FakeSession:
+            def client(self, service, **kwargs):
+                nonlocal active, peak
+                with counter_lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.01)
+                with counter_lock:
+                    active -= 1
+                return object()
+
+        session._get_client.cache_clear()
+        try:
+            with patch.object(session, "get_session", return_value=FakeSession()):
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    clients = list(
+                        pool.map(
+                            lambda s: session.get_client(None, "us-east-1", s),
+                            ["ec2", "rds", "s3", "ec2"],
+                        )
+                    )
+        finally:
+            session._get_client.cache_clear()
+
+        assert peak == 1
+        assert clients[0] is clients[3]  # still cached
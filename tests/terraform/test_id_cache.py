@@ -0,0 +1,58 @@
+"""Tests for the on-disk state ID cache"""
+
+from unittest.mock import patch
+
+from infra_archaeology_mcp.terraform import id_cache
+
+
+class TestIdCache:
+
+    def test_round_trip_ids(self, tmp_path, monkeypatch):
+        """Read back IDs written for a state version"""
+        monkeypatch.setattr(id_cache, "CACHE_DIR", tmp_path)
+        path = id_cache.cache_path("s3://bucket/terraform.tfstate", '"etag1"')
+
+        assert id_cache.read_ids(path) is None
+
+        id_cache.write_ids(path, frozenset({"i-aaa", "i-bbb"}))
+        assert id_cache.read_ids(path) == {"i-aaa", "i-bbb"}
+
+    def test_new_version_replaces_old(self, tmp_path, monkeypatch):
+        """Writing a new version drops the stale entry"""
+        monkeypatch.setattr(id_cache, "CACHE_DIR", tmp_path)
+        old_path = id_cache.cache_path("state.tfstate", "1:100")
+        new_path = id_cache.cache_path("state.tfstate", "2:120")
+
+        id_cache.write_ids(old_path, frozenset({"i-old"}))
+        id_cache.write_ids(new_path, frozenset({"i-new"}))
+
+        assert not old_path.exists()
+        assert id_cache.read_ids(new_path) == {"i-new"}
+
+    def test_round_trip_empty_ids(self, tmp_path, monkeypatch):
+        """An empty ID set is a hit, not a miss"""
+        monkeypatch.setattr(id_cache, "CACHE_DIR", tmp_path)
+        path = id_cache.cache_path("empty.tfstate", "1:0")
+
+        id_cache.write_ids(path, frozenset())
+        assert id_cache.read_ids(path) == frozenset()
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path, monkeypatch):
+        """A failed rename cleans up its temp file"""
+        monkeypatch.setattr(id_cache, "CACHE_DIR", tmp_path)
+        path = id_cache.cache_path("state.tfstate", "1:100")
+
+        with patch.object(id_cache.os, "replace", side_effect=OSError("disk full")):
+            id_cache.write_ids(path, frozenset({"i-aaa"}))
+
+        assert list(path.parent.iterdir()) == []
+
+    def test_remove_leftover_temp_files(self, tmp_path, monkeypatch):
+        """Leftover temp files are cleaned on the next write"""
+        monkeypatch.setattr(id_cache, "CACHE_DIR", tmp_path)
+        path = id_cache.cache_path("state.tfstate", "1:100")
+        path.parent.mkdir(parents=True)
+        (path.parent / "leftover.tmp").write_text("i-partial")
+
+        id_cache.write_ids(path, frozenset({"i-aaa"}))
+        assert list(path.parent.iterdir()) == [path]
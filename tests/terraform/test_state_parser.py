@@ -2,6 +2,7 @@
 
 import pytest
 import json
+from infra_archaeology_mcp.terraform import state_parser
 from infra_archaeology_mcp.terraform.state_parser import TerraformStateParser
 
 
@@ -77,8 +78,8 @@ class TestTerraformStateParser:
 
         ec2 = parser.find_by_id("i-1234567890abcdef0")
         assert ec2 is not None
-        assert ec2["address"] == "aws_instance.web_server"
-        assert ec2["type"] == "aws_instance"
+        assert ec2.address == "aws_instance.web_server"
+        assert ec2.type == "aws_instance"
 
     def test_build_id_to_terraform_map(self):
         """Build AWS resource ID -> Terraform metadata lookup"""
@@ -98,6 +99,115 @@ class TestTerraformStateParser:
         assert ec2["type"] == "aws_instance"
         assert ec2["attributes"]["instance_type"] == "t3.micro"
 
+        # Built once per load
+        assert parser.build_id_map() is id_map
+
+    def test_parse_json_snapshot(self):
+        """Parse state into an immutable snapshot"""
+        state = TerraformStateParser.parse_json(json.dumps(SAMPLE_STATE))
+
+        assert len(state.resources) == 3
+        assert state.id_map["main-db"].address == "aws_db_instance.main_db"
+
+        with pytest.raises(ValueError):
+            TerraformStateParser.parse_json("invalid json {{{")
+
+    def test_load_state_from_file(self, tmp_path):
+        """Load resources from a state file on disk"""
+        state_path = tmp_path / "terraform.tfstate"
+        state_path.write_text(json.dumps(SAMPLE_STATE))
+
+        parser = TerraformStateParser()
+        parser.load_from_file(str(state_path))
+
+        assert len(parser.resources) == 3
+        assert parser.find_by_id("main-db").address == "aws_db_instance.main_db"
+
+        state_path.write_text("invalid json {{{")
+        with pytest.raises(ValueError):
+            parser.load_from_file(str(state_path))
+
+        state_path.write_text("")
+        with pytest.raises(ValueError):
+            parser.load_from_file(str(state_path))
+
+    def test_stream_large_state_file(self, tmp_path, monkeypatch):
+        """Stream states above the threshold"""
+        monkeypatch.setattr(state_parser, "STREAM_THRESHOLD_BYTES", 0)
+        state_path = tmp_path / "terraform.tfstate"
+        state_path.write_text(json.dumps(SAMPLE_STATE))
+
+        parser = TerraformStateParser()
+        parser.load_from_file(str(state_path))
+
+        assert len(parser.resources) == 3
+        assert parser.find_by_id("my-app-bucket-12345").type == "aws_s3_bucket"
+
+        state_path.write_text("invalid json {{{")
+        with pytest.raises(ValueError):
+            parser.load_from_file(str(state_path))
+
+    def test_parse_file_cached_until_changed(self, tmp_path):
+        """Reuse parsed state until the file changes"""
+        state_path = tmp_path / "terraform.tfstate"
+        state_path.write_text(json.dumps(SAMPLE_STATE))
+
+        first = TerraformStateParser.parse_file(str(state_path))
+        assert TerraformStateParser.parse_file(str(state_path)) is first
+        assert len(first.resources) == 3
+
+        state_path.write_text(json.dumps({"version": 4, "resources": []}))
+        assert TerraformStateParser.parse_file(str(state_path)).id_map == {}
+
+    def test_find_by_id_and_type(self, tmp_path):
+        """Skip same-ID siblings of other resource types"""
+        policy = {
+            "mode": "managed",
+            "type": "aws_s3_bucket_policy",
+            "name": "app_bucket",
+            "instances": [{"attributes": {"id": "my-app-bucket-12345"}}]
+        }
+        state = dict(SAMPLE_STATE, resources=[policy] + SAMPLE_STATE["resources"])
+        state_path = tmp_path / "terraform.tfstate"
+        state_path.write_text(json.dumps(state))
+
+        parsed = TerraformStateParser.parse_json(json.dumps(state))
+        assert parsed.find("my-app-bucket-12345").type == "aws_s3_bucket_policy"
+
+        wanted = frozenset({"aws_s3_bucket"})
+        assert parsed.find("my-app-bucket-12345", wanted).type == "aws_s3_bucket"
+        assert TerraformStateParser.find_in_file(
+            str(state_path), "my-app-bucket-12345", wanted
+        ).type == "aws_s3_bucket"
+        assert parsed.find("main-db", wanted) is None
+
+    def test_find_in_file_stops_at_match(self, tmp_path):
+        """Stream-search a state file for one resource"""
+        state_path = tmp_path / "terraform.tfstate"
+        # Match sits before an unparseable tail
+        text = json.dumps(SAMPLE_STATE)
+        state_path.write_text(text[:text.index('"aws_s3_bucket"')] + "{{{")
+
+        resource = TerraformStateParser.find_in_file(
+            str(state_path), "i-1234567890abcdef0"
+        )
+        assert resource.address == "aws_instance.web_server"
+
+        state_path.write_text(text)
+        assert TerraformStateParser.find_in_file(str(state_path), "i-missing") is None
+
+    def test_stream_ids_in_file(self, tmp_path):
+        """Stream only the managed IDs from a state file"""
+        state_path = tmp_path / "terraform.tfstate"
+        state_path.write_text(json.dumps(SAMPLE_STATE))
+
+        ids = TerraformStateParser.ids_in_file(str(state_path))
+        assert ids == set(TerraformStateParser.parse_json(json.dumps(SAMPLE_STATE)).id_map)
+
+        state_path.write_text("invalid json {{{")
+        with pytest.raises(ValueError):
+            TerraformStateParser.ids_in_file(str(state_path))
+
     def test_handle_missing_or_invalid_state(self):
         """Graceful error handling for bad input"""
         parser = TerraformStateParser()
@@ -0,0 +1,28 @@
+"""Tests for creator_lookup tool"""
+
+from infra_archaeology_mcp.tools.creator_lookup import _parse_user_agent
+
+
+class TestParseUserAgent:
+
+    def test_parse_console_agent(self):
+        """Detect AWS Console creation"""
+        assert _parse_user_agent("signin.amazonaws.com Console") == "AWS Console"
+
+    def test_parse_terraform_agent(self):
+        """Detect Terraform creation"""
+        agent = "APN/1.0 HashiCorp/1.0 Terraform/1.5.0 terraform-provider-aws/5.0"
+        assert _parse_user_agent(agent) == "Terraform"
+
+    def test_parse_cloudformation_agent(self):
+        """Detect CloudFormation creation"""
+        assert _parse_user_agent("cloudformation.amazonaws.com") == "CloudFormation"
+
+    def test_parse_cli_agent(self):
+        """Detect AWS CLI creation"""
+        assert _parse_user_agent("aws-cli/2.15.0 Python/3.11.6") == "AWS CLI"
+
+    def test_parse_unknown_agent(self):
+        """Fall back to truncated raw agent"""
+        result = _parse_user_agent("Boto3/1.35.0 Python/3.12")
+        assert result == "API (Boto3/1.35.0 Python/3.12...)"
@@ -11,10 +11,10 @@ async def test():
     )
     
     print("Result:")
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
 if __name__ == "__main__":
-    import json
+    import orjson
     asyncio.run(test())
     
     
@@ -1,14 +1,22 @@
 """Tests for orphan detector"""
 
 import pytest
+import asyncio
 import json
 import tempfile
+from datetime import datetime
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import EndpointConnectionError
+from infra_archaeology_mcp.terraform import id_cache
 from infra_archaeology_mcp.tools.orphan_detector import (
     find_orphaned_resources,
     _build_managed_id_set,
+    _bucket_region,
+    _describe_bucket,
+    _fetch_aws_resources,
     _generate_recommendation,
+    _parse_state_bytes,
 )
 
 
@@ -48,22 +56,29 @@ SAMPLE_COSTS = {
 }
 
 
+@pytest.fixture(scope="session")
+def sample_state_path(tmp_path_factory):
+    """Write SAMPLE_STATE once for the whole session"""
+    state_path = tmp_path_factory.mktemp("state") / "terraform.tfstate"
+    state_path.write_text(json.dumps(SAMPLE_STATE))
+    return str(state_path)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep the state ID cache out of the home directory"""
+    monkeypatch.setattr(id_cache, "CACHE_DIR", tmp_path / "cache")
+
+
 class TestBuildManagedIdSet:
 
     @pytest.mark.asyncio
-    async def test_build_from_local_state(self):
+    async def test_build_from_local_state(self, sample_state_path):
         """Build managed ID set from local state file"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".tfstate", delete=False) as f:
-            json.dump(SAMPLE_STATE, f)
-            state_path = f.name
-
-        try:
-            managed_ids = await _build_managed_id_set([state_path])
-            assert "i-managed001" in managed_ids
-            assert "managed-bucket-123" in managed_ids
-            assert len(managed_ids) == 2
-        finally:
-            Path(state_path).unlink()
+        managed_ids = await _build_managed_id_set([sample_state_path])
+        assert "i-managed001" in managed_ids
+        assert "managed-bucket-123" in managed_ids
+        assert len(managed_ids) == 2
 
     @pytest.mark.asyncio
     async def test_build_from_multiple_states(self):
@@ -92,6 +107,40 @@ class TestBuildManagedIdSet:
             Path(path1).unlink()
             Path(path2).unlink()
 
+    @pytest.mark.asyncio
+    async def test_reuse_cached_ids_until_state_changes(self, tmp_path):
+        """Serve cached IDs until the state file changes"""
+        state_path = tmp_path / "terraform.tfstate"
+        state_path.write_text(json.dumps(SAMPLE_STATE))
+
+        assert len(await _build_managed_id_set([str(state_path)])) == 2
+
+        # Below any in-memory parse cache
+        with patch(
+            "infra_archaeology_mcp.tools.orphan_detector._load_local_ids"
+        ) as mock_load:
+            assert len(await _build_managed_id_set([str(state_path)])) == 2
+            mock_load.assert_not_called()
+
+        state_path.write_text(json.dumps({"version": 4, "resources": []}))
+        assert await _build_managed_id_set([str(state_path)]) == set()
+
+    @pytest.mark.asyncio
+    async def test_cache_relative_paths_per_directory(self, tmp_path, monkeypatch):
+        """Same relative path in two projects keeps two slots"""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "terraform.tfstate").write_text(json.dumps(SAMPLE_STATE))
+            monkeypatch.chdir(tmp_path / name)
+            await _build_managed_id_set(["terraform.tfstate"])
+
+        monkeypatch.chdir(tmp_path / "a")
+        with patch(
+            "infra_archaeology_mcp.tools.orphan_detector._load_local_ids"
+        ) as mock_load:
+            assert len(await _build_managed_id_set(["terraform.tfstate"])) == 2
+            mock_load.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_handle_invalid_state_gracefully(self):
         """Continue if one state file is invalid"""
@@ -115,6 +164,19 @@ class TestBuildManagedIdSet:
             Path(valid_path).unlink()
 
 
+class TestParseStateBytes:
+
+    def test_parse_ids_from_bytes(self):
+        """Extract managed IDs straight from state bytes"""
+        managed_ids = _parse_state_bytes(json.dumps(SAMPLE_STATE).encode())
+        assert managed_ids == {"i-managed001", "managed-bucket-123"}
+
+    def test_reject_invalid_bytes(self):
+        """Invalid state bytes raise ValueError"""
+        with pytest.raises(ValueError):
+            _parse_state_bytes(b"invalid json {{{")
+
+
 class TestFindOrphanedResources:
 
     @pytest.mark.asyncio
@@ -167,6 +229,53 @@ class TestFindOrphanedResources:
         costs = [r["monthly_cost"] for r in result["orphaned_resources"]]
         assert costs == sorted(costs, reverse=True)
 
+    @pytest.mark.asyncio
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_aws_resources")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_costs")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._build_managed_id_set")
+    async def test_limit_to_top_k_by_cost(
+        self, mock_managed, mock_costs, mock_aws
+    ):
+        """Return only the K most expensive orphans"""
+        mock_managed.return_value = {"i-managed001", "managed-bucket-123"}
+        mock_aws.return_value = SAMPLE_AWS_RESOURCES
+        mock_costs.return_value = SAMPLE_COSTS
+
+        result = await find_orphaned_resources(
+            region="us-east-1",
+            state_sources=["fake/state.tfstate"],
+            top_k=2
+        )
+
+        orphan_ids = [r["resource_id"] for r in result["orphaned_resources"]]
+        assert orphan_ids == ["i-orphan001", "i-orphan002"]
+        assert result["summary"]["total_orphaned"] == 3
+        assert result["summary"]["total_monthly_cost"] == 225.00
+
+    @pytest.mark.asyncio
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_aws_resources")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_costs")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._build_managed_id_set")
+    async def test_keep_same_id_across_types(
+        self, mock_managed, mock_costs, mock_aws
+    ):
+        """Report same-named RDS and S3 orphans separately"""
+        mock_managed.return_value = set()
+        mock_aws.return_value = [
+            {"resource_id": "analytics", "resource_type": "rds", "state": "available"},
+            {"resource_id": "analytics", "resource_type": "s3", "is_empty": False},
+        ]
+        mock_costs.return_value = {}
+
+        result = await find_orphaned_resources(
+            region="us-east-1",
+            state_sources=["fake/state.tfstate"]
+        )
+
+        assert result["summary"]["total_orphaned"] == 2
+        types = [r["resource_type"] for r in result["orphaned_resources"]]
+        assert types == ["rds", "s3"]  # fetch order on ties
+
     @pytest.mark.asyncio
     @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_aws_resources")
     @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_costs")
@@ -187,6 +296,116 @@ class TestFindOrphanedResources:
         assert result["summary"]["total_orphaned"] == 3
         assert result["summary"]["total_monthly_cost"] == 225.00
 
+    @pytest.mark.asyncio
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_aws_resources")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_costs")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._build_managed_id_set")
+    async def test_skip_costs_without_orphans(
+        self, mock_managed, mock_costs, mock_aws
+    ):
+        """Skip Cost Explorer when everything is managed"""
+        mock_managed.return_value = {"i-managed001", "managed-bucket-123"}
+        mock_aws.return_value = SAMPLE_AWS_RESOURCES[:1]
+
+        result = await find_orphaned_resources(
+            region="us-east-1",
+            state_sources=["fake/state.tfstate"]
+        )
+
+        mock_costs.assert_not_called()
+        assert result["summary"]["total_orphaned"] == 0
+        assert result["orphaned_resources"] == []
+
+    @pytest.mark.asyncio
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_aws_resources")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._fetch_costs")
+    @patch("infra_archaeology_mcp.tools.orphan_detector._build_managed_id_set")
+    async def test_fetch_state_and_aws_concurrently(
+        self, mock_managed, mock_costs, mock_aws
+    ):
+        """Load state while the AWS scan is in flight"""
+        scan_started = asyncio.Event()
+
+        async def load_state(state_sources):
+            await scan_started.wait()  # deadlocks if run sequentially
+            return {"i-managed001", "managed-bucket-123"}
+
+        async def scan(region, resource_types):
+            scan_started.set()
+            return SAMPLE_AWS_RESOURCES[:1]
+
+        mock_managed.side_effect = load_state
+        mock_aws.side_effect = scan
+
+        result = await asyncio.wait_for(
+            find_orphaned_resources(
+                region="us-east-1",
+                state_sources=["fake/state.tfstate"]
+            ),
+            timeout=1
+        )
+
+        assert result["summary"]["total_orphaned"] == 0
+
+
+class TestFetchAwsResources:
+
+    @pytest.mark.asyncio
+    @patch("infra_archaeology_mcp.tools.orphan_detector._scan_aws_resources")
+    async def test_coalesce_concurrent_scans(self, mock_scan):
+        """Concurrent identical scans share one AWS call"""
+        async def slow_scan(region, resource_types):
+            await asyncio.sleep(0.01)
+            return SAMPLE_AWS_RESOURCES
+
+        mock_scan.side_effect = slow_scan
+
+        first, second = await asyncio.gather(
+            _fetch_aws_resources("us-east-1", ["ec2", "s3"]),
+            _fetch_aws_resources("us-east-1", ["s3", "ec2"]),
+        )
+
+        assert mock_scan.call_count == 1
+        assert first == second == SAMPLE_AWS_RESOURCES
+        assert first[0] is not second[0]  # each caller gets copies
+
+
+class TestBucketRegion:
+
+    def test_read_region_header(self):
+        """Region comes from the HeadBucket header"""
+        s3 = MagicMock()
+        s3.head_bucket.return_value = {
+            "ResponseMetadata": {"HTTPHeaders": {"x-amz-bucket-region": "eu-west-1"}}
+        }
+        assert _bucket_region(s3, "logs") == "eu-west-1"
+
+    def test_skip_bucket_on_transport_error(self):
+        """Connection errors skip the bucket, not the scan"""
+        s3 = MagicMock()
+        s3.head_bucket.side_effect = EndpointConnectionError(endpoint_url="https://s3")
+        assert _bucket_region(s3, "logs") is None
+
+
+class TestDescribeBucket:
+
+    BUCKET = {"Name": "logs", "CreationDate": datetime(2024, 1, 1)}
+
+    def test_trust_nonzero_metric_count(self):
+        """Nonzero CloudWatch count skips the listing"""
+        s3 = MagicMock()
+        result = _describe_bucket(s3, self.BUCKET, object_count=12)
+        s3.list_objects_v2.assert_not_called()
+        assert result["is_empty"] is False
+
+    def test_confirm_zero_metric_count(self):
+        """Stale zero count is checked with a listing"""
+        s3 = MagicMock()
+        s3.list_objects_v2.return_value = {"KeyCount": 1}
+        result = _describe_bucket(s3, self.BUCKET, object_count=0)
+        s3.list_objects_v2.assert_called_once_with(Bucket="logs", MaxKeys=1)
+        assert result["is_empty"] is False
+
 
 class TestGenerateRecommendation:
 
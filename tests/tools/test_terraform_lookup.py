@@ -2,13 +2,17 @@
 
 import pytest
 import json
-import tempfile
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from infra_archaeology_mcp.tools import terraform_lookup
 from infra_archaeology_mcp.tools.terraform_lookup import (
     parse_resource_identifier,
+    discover_state_files,
+    what_terraform_owns_resource,
     UnsupportedResourceError,
     _search_state_file,
     _extract_workspace,
+    _load_state_from_s3,
     ResourceIdentifier,
 )
 
@@ -96,94 +100,78 @@ SAMPLE_STATE = {
 }
 
 
+@pytest.fixture(scope="session")
+def sample_state_path(tmp_path_factory):
+    """Write SAMPLE_STATE once for the whole session"""
+    state_path = tmp_path_factory.mktemp("state") / "terraform.tfstate"
+    state_path.write_text(json.dumps(SAMPLE_STATE))
+    return str(state_path)
+
+
 class TestSearchStateFile:
 
     @pytest.mark.asyncio
-    async def test_search_local_state_file(self):
+    async def test_search_local_state_file(self, sample_state_path):
         """Find resource in local state file"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".tfstate", delete=False) as f:
-            json.dump(SAMPLE_STATE, f)
-            state_path = f.name
-
-        try:
-            identifier = ResourceIdentifier(
-                service="ec2",
-                resource_id="i-1234567890abcdef0",
-                terraform_types=["aws_instance"],
-                original_input="i-1234567890abcdef0"
-            )
-
-            result = await _search_state_file(state_path, identifier)
-
-            assert result is not None
-            assert result["terraform_address"] == "aws_instance.web_server"
-            assert result["resource_type"] == "aws_instance"
-            assert result["state_location"] == state_path
-        finally:
-            Path(state_path).unlink()
+        identifier = ResourceIdentifier(
+            service="ec2",
+            resource_id="i-1234567890abcdef0",
+            terraform_types=["aws_instance"],
+            original_input="i-1234567890abcdef0"
+        )
+
+        result = await _search_state_file(sample_state_path, identifier)
+
+        assert result is not None
+        assert result["terraform_address"] == "aws_instance.web_server"
+        assert result["resource_type"] == "aws_instance"
+        assert result["state_location"] == sample_state_path
 
     @pytest.mark.asyncio
-    async def test_search_local_state_directory(self):
+    async def test_search_local_state_directory(self, sample_state_path):
         """Find resource when given directory path"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_path = Path(tmpdir) / "terraform.tfstate"
-            with open(state_path, "w") as f:
-                json.dump(SAMPLE_STATE, f)
+        state_dir = str(Path(sample_state_path).parent)
 
-            identifier = ResourceIdentifier(
-                service="ec2",
-                resource_id="i-1234567890abcdef0",
-                terraform_types=["aws_instance"],
-                original_input="i-1234567890abcdef0"
-            )
+        identifier = ResourceIdentifier(
+            service="ec2",
+            resource_id="i-1234567890abcdef0",
+            terraform_types=["aws_instance"],
+            original_input="i-1234567890abcdef0"
+        )
 
-            result = await _search_state_file(tmpdir, identifier)
+        result = await _search_state_file(state_dir, identifier)
 
-            assert result is not None
-            assert result["terraform_address"] == "aws_instance.web_server"
+        assert result is not None
+        assert result["terraform_address"] == "aws_instance.web_server"
 
     @pytest.mark.asyncio
-    async def test_search_module_resource(self):
+    async def test_search_module_resource(self, sample_state_path):
         """Find resource inside a module"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".tfstate", delete=False) as f:
-            json.dump(SAMPLE_STATE, f)
-            state_path = f.name
-
-        try:
-            identifier = ResourceIdentifier(
-                service="ec2",  # doesn't matter for lookup
-                resource_id="subnet-abc123",
-                terraform_types=["aws_subnet"],
-                original_input="subnet-abc123"
-            )
-
-            result = await _search_state_file(state_path, identifier)
-
-            assert result is not None
-            assert result["terraform_address"] == "module.vpc.aws_subnet.public[0]"
-            assert result["module"] == "module.vpc"
-        finally:
-            Path(state_path).unlink()
+        identifier = ResourceIdentifier(
+            service="ec2",  # doesn't matter for lookup
+            resource_id="subnet-abc123",
+            terraform_types=["aws_subnet"],
+            original_input="subnet-abc123"
+        )
+
+        result = await _search_state_file(sample_state_path, identifier)
+
+        assert result is not None
+        assert result["terraform_address"] == "module.vpc.aws_subnet.public[0]"
+        assert result["module"] == "module.vpc"
 
     @pytest.mark.asyncio
-    async def test_search_resource_not_found(self):
+    async def test_search_resource_not_found(self, sample_state_path):
         """Return None when resource not in state"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".tfstate", delete=False) as f:
-            json.dump(SAMPLE_STATE, f)
-            state_path = f.name
-
-        try:
-            identifier = ResourceIdentifier(
-                service="ec2",
-                resource_id="i-doesnotexist",
-                terraform_types=["aws_instance"],
-                original_input="i-doesnotexist"
-            )
-
-            result = await _search_state_file(state_path, identifier)
-            assert result is None
-        finally:
-            Path(state_path).unlink()
+        identifier = ResourceIdentifier(
+            service="ec2",
+            resource_id="i-doesnotexist",
+            terraform_types=["aws_instance"],
+            original_input="i-doesnotexist"
+        )
+
+        result = await _search_state_file(sample_state_path, identifier)
+        assert result is None
 
     @pytest.mark.asyncio
     async def test_search_nonexistent_file(self):
@@ -199,6 +187,93 @@ class TestSearchStateFile:
         assert result is None
 
 
+class TestLoadStateFromS3:
+
+    @staticmethod
+    def _mock_session(content: bytes) -> MagicMock:
+        body = MagicMock()
+        body.__aenter__ = AsyncMock(return_value=body)
+        body.__aexit__ = AsyncMock(return_value=None)
+        body.read = AsyncMock(return_value=content)
+
+        s3 = MagicMock()
+        s3.__aenter__ = AsyncMock(return_value=s3)
+        s3.__aexit__ = AsyncMock(return_value=None)
+        s3.get_object = AsyncMock(return_value={"Body": body, "ETag": '"abc"'})
+
+        session = MagicMock()
+        session.client.return_value = s3
+        return session
+
+    @pytest.mark.asyncio
+    async def test_skip_caching_large_states(self, monkeypatch):
+        """States above the threshold are not kept in memory"""
+        content = json.dumps(SAMPLE_STATE).encode()
+        monkeypatch.setattr(terraform_lookup, "_s3_states", {})
+
+        with patch.object(
+            terraform_lookup, "get_async_session",
+            return_value=self._mock_session(content)
+        ):
+            await _load_state_from_s3("s3://bucket/small.tfstate")
+            monkeypatch.setattr(terraform_lookup, "STREAM_THRESHOLD_BYTES", len(content) - 1)
+            state, _ = await _load_state_from_s3("s3://bucket/large.tfstate")
+
+        assert state.find("i-1234567890abcdef0") is not None
+        assert list(terraform_lookup._s3_states) == ["s3://bucket/small.tfstate"]
+
+
+class TestWhatTerraformOwnsResource:
+
+    @pytest.mark.asyncio
+    async def test_conflict_detection_toggle(self, tmp_path):
+        """Report conflicts, or stop at first match"""
+        paths = []
+        for name in ("a", "b"):
+            state_path = tmp_path / f"{name}.tfstate"
+            state_path.write_text(json.dumps(SAMPLE_STATE))
+            paths.append(str(state_path))
+
+        result = await what_terraform_owns_resource(
+            "i-1234567890abcdef0", state_sources=paths, discovery_mode="explicit"
+        )
+        assert result["conflict"] is True
+        assert len(result["matches"]) == 2
+
+        result = await what_terraform_owns_resource(
+            "i-1234567890abcdef0", state_sources=paths, discovery_mode="explicit",
+            conflict_detection=False
+        )
+        assert result["terraform_managed"] is True
+        assert len(result["matches"]) == 1
+
+
+    @pytest.mark.asyncio
+    async def test_find_lowercase_bare_rds_id(self, tmp_path):
+        """Lowercase RDS IDs also match the S3 pattern"""
+        state_path = tmp_path / "terraform.tfstate"
+        state_path.write_text(json.dumps({"version": 4, "resources": [
+            {"mode": "managed", "type": "aws_db_instance", "name": "main",
+             "instances": [{"attributes": {"id": "prod-postgres"}}]}
+        ]}))
+
+        result = await what_terraform_owns_resource(
+            "prod-postgres", state_sources=[str(state_path)], discovery_mode="explicit"
+        )
+        assert result["terraform_managed"] is True
+        assert result["matches"][0]["resource_type"] == "aws_db_instance"
+
+
+class TestDiscoverStateFiles:
+
+    @pytest.mark.asyncio
+    async def test_dedupe_keeps_source_order(self):
+        """Dedupe explicit sources in first-seen order"""
+        sources = ["b.tfstate", "a.tfstate", "b.tfstate", "c.tfstate"]
+        result = await discover_state_files("explicit", state_sources=sources)
+        assert result == ["b.tfstate", "a.tfstate", "c.tfstate"]
+
+
 class TestExtractWorkspace:
 
     def test_extract_from_env_directory(self):